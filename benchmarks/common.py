@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers shared by the modeltranslation benchmarks.
+
+The benchmarks are standalone scripts which configure a minimal Django
+environment themselves. Run them from the repository root, e.g.::
+
+    python benchmarks/descriptor_access.py
+"""
+import os
+import subprocess
+import sys
+import timeit
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Number of languages the benchmarks are run with by default
+LANGUAGE_COUNTS = (2, 10, 40)
+
+
+def build_languages(count):
+    """
+    Returns a ``settings.LANGUAGES`` like tuple of ``count`` languages. The
+    first two languages are always ``en`` and ``de``.
+    """
+    codes = ['en', 'de'] + ['l%02d' % i for i in range(2, count)]
+    return tuple((code, code.upper()) for code in codes[:count])
+
+
+def configure(languages=2, **extra_settings):
+    """
+    Configures Django with an in-memory sqlite database and ``languages``
+    languages.
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from django.conf import settings
+    options = {
+        'DATABASES': {'default': {'ENGINE': 'django.db.backends.sqlite3',
+                                  'NAME': ':memory:'}},
+        'INSTALLED_APPS': (),
+        'LANGUAGES': build_languages(languages),
+        'LANGUAGE_CODE': 'en',
+        'USE_I18N': True,
+        'MODELTRANSLATION_ENABLE_REGISTRATIONS': False,
+    }
+    options.update(extra_settings)
+    settings.configure(**options)
+
+
+def create_table(model):
+    """
+    Creates the database table for ``model`` without going through syncdb.
+    """
+    from django.core.management.color import no_style
+    from django.db import connection
+    sql, references = connection.creation.sql_create_model(model, no_style())
+    cursor = connection.cursor()
+    for statement in sql:
+        cursor.execute(statement)
+
+
+def best_of(func, number, repeat=5):
+    """
+    Returns the best time in seconds for a single call of ``func``.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(label, seconds, unit='op'):
+    print('  %-40s %10.3f us/%s %14.0f %s/s' % (
+        label, seconds * 1e6, unit, 1 / seconds, unit))
+
+
+def legacy_get_language():
+    """
+    The former ``modeltranslation.utils.get_language``.
+    """
+    from django.utils.translation import get_language as _get_language
+    from modeltranslation import settings
+    lang = _get_language()
+    if lang not in settings.AVAILABLE_LANGUAGES and '-' in lang:
+        lang = lang.split('-')[0]
+    if lang in settings.AVAILABLE_LANGUAGES:
+        return lang
+    return settings.DEFAULT_LANGUAGE
+
+
+class LegacyTranslationFieldDescriptor(object):
+    """
+    The former ``TranslationFieldDescriptor``, which the benchmarks compare
+    against.
+    """
+    def __init__(self, name, fallback_value=None):
+        self.name = name
+        self.fallback_value = fallback_value
+
+    def __set__(self, instance, value):
+        from modeltranslation.utils import build_localized_fieldname
+        loc_field_name = build_localized_fieldname(
+            self.name, legacy_get_language())
+        setattr(instance, loc_field_name, value)
+        instance.__dict__[self.name] = value
+
+    def __get__(self, instance, owner):
+        from modeltranslation.utils import build_localized_fieldname
+        loc_field_name = build_localized_fieldname(
+            self.name, legacy_get_language())
+        if hasattr(instance, loc_field_name):
+            if getattr(instance, loc_field_name):
+                return getattr(instance, loc_field_name)
+            elif self.fallback_value is None:
+                return instance.__dict__[self.name]
+            else:
+                return self.fallback_value
+
+
+def run_for_language_counts(script, counts=LANGUAGE_COUNTS):
+    """
+    Runs ``script`` once per language count in a fresh interpreter, as the
+    languages are read from the settings only once on startup.
+    """
+    for count in counts:
+        print('%d languages:' % count)
+        sys.stdout.flush()
+        subprocess.check_call(
+            [sys.executable, script, '--languages', str(count)])
+
+
+def language_count_from_argv():
+    if '--languages' in sys.argv:
+        return int(sys.argv[sys.argv.index('--languages') + 1])
+    return None
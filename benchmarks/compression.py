@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Compares compressed translation fields (see the ``compress`` translation
+option) to plain translation fields: the bytes the translations of a text
+field take in the table, and how fast rows are loaded with and without
+reading the translated text.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common
+
+
+PARAGRAPH = (u'Modeltranslation stores the translations of a field in '
+             u'columns of their own, one per language. Body texts in many '
+             u'languages make up most of the size of such tables. ')
+
+
+def main(languages):
+    common.configure(languages)
+    from django.db import connection, models
+    from django.utils import translation
+    from modeltranslation.translator import translator, TranslationOptions
+
+    class News(models.Model):
+        title = models.CharField(max_length=255)
+        text = models.TextField()
+
+        class Meta:
+            app_label = 'benchmarks'
+
+    class CompressedNews(models.Model):
+        title = models.CharField(max_length=255)
+        text = models.TextField()
+
+        class Meta:
+            app_label = 'benchmarks'
+
+    class NewsTranslationOptions(TranslationOptions):
+        fields = ('title', 'text',)
+
+    class CompressedNewsTranslationOptions(TranslationOptions):
+        fields = ('title', 'text',)
+        compress = ('text',)
+
+    translator.register(News, NewsTranslationOptions)
+    translator.register(CompressedNews, CompressedNewsTranslationOptions)
+    common.create_table(News)
+    common.create_table(CompressedNews)
+
+    rows = 500
+    codes = [code for code, name in common.build_languages(languages)]
+    for model in (News, CompressedNews):
+        objs = []
+        for i in range(rows):
+            values = {}
+            for code in codes:
+                values['title_%s' % code] = u'Title %s %d' % (code, i)
+                values['text_%s' % code] = u'%s %d: %s' % (
+                    code, i, PARAGRAPH * 15)
+            objs.append(model(title=u'Title', text=u'Text', **values))
+        model.objects.bulk_create(objs)
+    translation.activate(codes[-1])
+
+    def text_bytes(model):
+        columns = ' + '.join('LENGTH(CAST(text_%s AS BLOB))' % code
+                             for code in codes)
+        cursor = connection.cursor()
+        cursor.execute('SELECT SUM(%s) FROM %s' % (columns,
+                                                   model._meta.db_table))
+        return cursor.fetchone()[0]
+
+    plain_bytes = text_bytes(News)
+    compressed_bytes = text_bytes(CompressedNews)
+    print('  %-40s %10d bytes' % ('plain translations', plain_bytes))
+    print('  %-40s %10d bytes' % ('compressed translations',
+                                  compressed_bytes))
+    print('  ratio: %.2f' % (float(compressed_bytes) / plain_bytes))
+
+    for label, model in (('plain', News), ('compressed', CompressedNews)):
+        def load():
+            return list(model.objects.all())
+
+        def read():
+            return [obj.text for obj in model.objects.all()]
+        common.report('%s load' % label, common.best_of(load, 3) / rows,
+                      unit='row')
+        common.report('%s load and read text' % label,
+                      common.best_of(read, 3) / rows, unit='row')
+
+
+if __name__ == '__main__':
+    languages = common.language_count_from_argv()
+    if languages is None:
+        common.run_for_language_counts(os.path.abspath(__file__))
+    else:
+        main(languages)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Measures reading a translated field through ``TranslationFieldDescriptor``
+compared to the former implementation, which built the localized fieldname
+on every access.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common
+
+
+def main(languages):
+    common.configure(languages)
+    from django.db import models
+    from django.utils import translation
+    from modeltranslation.translator import translator, TranslationOptions
+    from modeltranslation.utils import get_language
+
+    class News(models.Model):
+        title = models.CharField(max_length=255)
+
+        class Meta:
+            app_label = 'benchmarks'
+
+    class NewsTranslationOptions(TranslationOptions):
+        fields = ('title',)
+
+    translator.register(News, NewsTranslationOptions)
+
+    values = dict(('title_%s' % code, u'Title %s' % code)
+                  for code, name in common.build_languages(languages))
+    news = News(**values)
+    # Activate the last language to get the worst case of the linear search
+    # in the former implementation.
+    translation.activate(common.build_languages(languages)[-1][0])
+
+    descriptor = News.__dict__['title']
+    legacy = common.LegacyTranslationFieldDescriptor('title')
+    number = 100000
+    current_get = common.best_of(
+        lambda: descriptor.__get__(news, News), number)
+    legacy_get = common.best_of(lambda: legacy.__get__(news, News), number)
+    current_lang = common.best_of(get_language, number)
+    legacy_lang = common.best_of(common.legacy_get_language, number)
+    common.report('legacy get_language', legacy_lang)
+    common.report('get_language', current_lang)
+    common.report('legacy descriptor __get__', legacy_get)
+    common.report('descriptor __get__', current_get)
+    print('  speedup: %.1fx' % (legacy_get / current_get))
+
+
+if __name__ == '__main__':
+    languages = common.language_count_from_argv()
+    if languages is None:
+        common.run_for_language_counts(os.path.abspath(__file__))
+    else:
+        main(languages)
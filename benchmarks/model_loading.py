@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how many rows per second a queryset of a translated model loads,
+compared to the former ``TranslationFieldDescriptor`` which updated the
+translation field of the current language for every loaded row.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common
+
+
+def main(languages):
+    common.configure(languages)
+    from django.db import models
+    from django.utils import translation
+    from modeltranslation.translator import translator, TranslationOptions
+
+    class News(models.Model):
+        title = models.CharField(max_length=255)
+        text = models.TextField()
+
+        class Meta:
+            app_label = 'benchmarks'
+
+    class NewsTranslationOptions(TranslationOptions):
+        fields = ('title', 'text',)
+
+    translator.register(News, NewsTranslationOptions)
+    common.create_table(News)
+
+    rows = 1000
+    codes = [code for code, name in common.build_languages(languages)]
+    values = {}
+    for code in codes:
+        values['title_%s' % code] = u'Title %s' % code
+        values['text_%s' % code] = u'Text %s' % code
+    News.objects.bulk_create(
+        [News(title=u'Title', text=u'Text', **values) for i in range(rows)])
+    translation.activate(codes[-1])
+
+    def load():
+        return list(News.objects.all())
+
+    current = common.best_of(load, 5) / rows
+    descriptors = dict((name, News.__dict__[name])
+                       for name in NewsTranslationOptions.fields)
+    for name in descriptors:
+        setattr(News, name, common.LegacyTranslationFieldDescriptor(name))
+    legacy = common.best_of(load, 5) / rows
+    for name, descriptor in descriptors.items():
+        setattr(News, name, descriptor)
+
+    common.report('legacy descriptor __set__', legacy, unit='row')
+    common.report('descriptor __set__', current, unit='row')
+    print('  speedup: %.2fx' % (legacy / current))
+
+
+if __name__ == '__main__':
+    languages = common.language_count_from_argv()
+    if languages is None:
+        common.run_for_language_counts(os.path.abspath(__file__))
+    else:
+        main(languages)
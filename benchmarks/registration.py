@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the startup cost of registering many models for translation, one
+``register`` call after the other compared to a ``translator.batch()``, as
+``autodiscover`` does. Every model has a foreign key to the model created
+before it, so each registration has related models whose field caches are
+deleted.
+"""
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common
+
+
+MODEL_COUNTS = (100, 500)
+
+
+def create_models(count):
+    from django.db import models
+    created = []
+    for i in range(count):
+        attrs = {
+            '__module__': __name__,
+            'Meta': type('Meta', (), {'app_label': 'benchmarks'}),
+            'title': models.CharField(max_length=255),
+            'text': models.TextField(),
+        }
+        if created:
+            attrs['previous'] = models.ForeignKey(created[-1],
+                                                  related_name='+')
+        created.append(type('Model%d' % i, (models.Model,), attrs))
+    return created
+
+
+def main(count, batch):
+    common.configure(10)
+    from django.db.models import get_models
+    from modeltranslation.translator import translator, TranslationOptions
+
+    class ModelTranslationOptions(TranslationOptions):
+        fields = ('title', 'text',)
+
+    created = create_models(count)
+    # Fill the field caches like the model loading of Django does
+    get_models()
+    for model in created:
+        model._meta.fields
+
+    start = time.time()
+    if batch:
+        with translator.batch():
+            for model in created:
+                translator.register(model, ModelTranslationOptions)
+    else:
+        for model in created:
+            translator.register(model, ModelTranslationOptions)
+    # Rebuild the field caches the registration deleted
+    for model in created:
+        model._meta.fields
+    print('  %-40s %10.3f s' % (
+        '%d models, %s' % (count, batch and 'batch' or 'one by one'),
+        time.time() - start))
+
+
+if __name__ == '__main__':
+    if '--models' in sys.argv:
+        main(int(sys.argv[sys.argv.index('--models') + 1]),
+             '--batch' in sys.argv)
+    else:
+        # Every run needs a fresh interpreter, as models are registered
+        # only once
+        for count in MODEL_COUNTS:
+            for extra in ([], ['--batch']):
+                sys.stdout.flush()
+                subprocess.check_call([sys.executable, __file__, '--models',
+                                       str(count)] + extra)
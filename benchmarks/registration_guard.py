@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Measures ``handle_translation_registrations``, which ``modeltranslation``
+runs when its models module is imported, compared to its former guard
+against re-entry that inspected the whole stack. Both are called at
+different stack depths, as the models module is usually imported deep
+within the startup of a WSGI server or a management command.
+"""
+import inspect
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common
+
+
+STACK_DEPTHS = (10, 50, 100)
+
+
+def legacy_handle_translation_registrations():
+    """
+    The former ``handle_translation_registrations``.
+    """
+    from modeltranslation import loading
+    from modeltranslation.translator import translator
+    for stack_info in inspect.stack()[1:]:
+        if 'legacy_handle_translation_registrations' in stack_info[3] \
+            and __file__ == stack_info[2]:
+            return
+    loading.autodiscover()
+    translator.freeze()
+
+
+def at_depth(depth, func):
+    if depth:
+        return at_depth(depth - 1, func)
+    return func()
+
+
+def main():
+    common.configure(MODELTRANSLATION_ENABLE_REGISTRATIONS=True)
+    from modeltranslation import loading
+
+    def current():
+        # Forget the former call, so that every call registers again
+        loading._registration_state = loading._RegistrationState()
+        loading.handle_translation_registrations()
+
+    def imported_again():
+        loading.handle_translation_registrations()
+
+    for depth in STACK_DEPTHS:
+        print('%d frames deep:' % depth)
+        legacy = common.best_of(
+            lambda: at_depth(depth, legacy_handle_translation_registrations),
+            100)
+        first = common.best_of(lambda: at_depth(depth, current), 100)
+        again = common.best_of(lambda: at_depth(depth, imported_again), 100)
+        common.report('legacy stack inspection', legacy)
+        common.report('once-guard, first call', first)
+        common.report('once-guard, later calls', again)
+        print('  speedup: %.2fx' % (legacy / first))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,8 +8,6 @@ from django.utils import translation
 
 from modeltranslation import settings
 from modeltranslation.translator import translator
-from modeltranslation.utils import (get_translation_fields,
-                                    build_localized_fieldname)
 
 
 class TranslationBaseModelAdmin(BaseModelAdmin):
@@ -20,6 +18,13 @@ class TranslationBaseModelAdmin(BaseModelAdmin):
         self.trans_opts = translator.get_options_for_model(self.model)
         self._patch_prepopulated_fields()
 
+    def queryset(self, request):
+        qs = super(TranslationBaseModelAdmin, self).queryset(request)
+        if getattr(self.trans_opts, 'defer_inactive_languages', False):
+            # The admin edits the translation fields of all languages at once
+            qs = qs.defer(None)
+        return qs
+
     def _declared_fieldsets(self):
         # Take custom modelform fields option into account
         if not self.fields and hasattr(
@@ -73,6 +78,18 @@ class TranslationBaseModelAdmin(BaseModelAdmin):
                     field.blank = False
             field.widget.attrs['class'] = ' '.join(css_classes)
 
+    def _get_translation_fields(self, field_name):
+        """
+        Returns the translation fields of ``field_name`` which can be edited,
+        translations which aren't stored in columns of their own are left
+        out (see ``modeltranslation.storage``).
+        """
+        storages = self.trans_opts.storages[field_name]
+        lookups = translator.get_lookups(self.model)
+        return [lookups.attnames[field_name, lang]
+                for lang in settings.AVAILABLE_LANGUAGES
+                if storages[lang].concrete]
+
     def _exclude_original_fields(self, exclude=None):
         if exclude is None:
             exclude = tuple()
@@ -102,7 +119,7 @@ class TranslationBaseModelAdmin(BaseModelAdmin):
             for opt in option:
                 if opt in self.trans_opts.fields:
                     index = option_new.index(opt)
-                    translation_fields = get_translation_fields(opt)
+                    translation_fields = self._get_translation_fields(opt)
                     option_new[index:index + 1] = translation_fields
             option = option_new
         return option
@@ -122,7 +139,7 @@ class TranslationBaseModelAdmin(BaseModelAdmin):
             prepopulated_fields_new = dict(self.prepopulated_fields)
             for (k, v) in self.prepopulated_fields.items():
                 if v[0] in self.trans_opts.fields:
-                    translation_fields = get_translation_fields(v[0])
+                    translation_fields = self._get_translation_fields(v[0])
                     prepopulated_fields_new[k] = tuple([translation_fields[0]])
             self.prepopulated_fields = prepopulated_fields_new
 
@@ -177,10 +194,11 @@ class TranslationBaseModelAdmin(BaseModelAdmin):
         if exclude_languages:
             excl_languages = exclude_languages
         exclude = []
+        lookups = translator.get_lookups(self.model)
         for orig_fieldname, translation_fields in \
             self.trans_opts.localized_fieldnames.iteritems():
             for tfield in translation_fields:
-                language = tfield.split('_')[-1]
+                language = lookups.translations[tfield][1]
                 if language in excl_languages and tfield not in exclude:
                     exclude.append(tfield)
         return tuple(exclude)
@@ -199,7 +217,7 @@ class TranslationAdmin(TranslationBaseModelAdmin, admin.ModelAdmin):
                 if field in self.trans_opts.fields:
                     index = editable_new.index(field)
                     display_index = display_new.index(field)
-                    translation_fields = get_translation_fields(field)
+                    translation_fields = self._get_translation_fields(field)
                     editable_new[index:index + 1] = translation_fields
                     display_new[display_index:display_index + 1] = \
                         translation_fields
@@ -225,8 +243,8 @@ class TranslationAdmin(TranslationBaseModelAdmin, admin.ModelAdmin):
         # field. See issue 47 for details.
         for k, v in self.trans_opts.localized_fieldnames.items():
             if getattr(obj, k):
-                default_lang_fieldname = build_localized_fieldname(
-                    k, settings.DEFAULT_LANGUAGE)
+                default_lang_fieldname = translator.get_localized_fieldname(
+                    self.model, k, settings.DEFAULT_LANGUAGE)
                 if not getattr(obj, default_lang_fieldname):
                     # TODO: Handle null values
                     setattr(obj, k, '')
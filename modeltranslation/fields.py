@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import zlib
+
 from django.core.exceptions import ImproperlyConfigured
-from django.db.models.fields import Field, CharField, TextField
+from django.db.models.fields import (Field, BooleanField, CharField,
+                                     TextField)
+from django.utils.encoding import smart_str, smart_unicode
+from django.utils.importlib import import_module
 
 from modeltranslation import settings
 from modeltranslation.utils import (get_language,
@@ -8,10 +13,21 @@ from modeltranslation.utils import (get_language,
                                     build_localized_verbose_name)
 
 
-def create_translation_field(model, field_name, lang):
+def get_localized_fieldname(model, field_name, lang):
+    """
+    Returns the name of the translation field of ``field_name`` of ``model``
+    in ``lang``.
+    """
+    # Imported here to avoid a circular import with the translator module.
+    from modeltranslation.translator import translator
+    return translator.get_localized_fieldname(model, field_name, lang)
+
+
+def create_translation_field(model, field_name, lang, compress=False):
     """
     Translation field factory. Returns a ``TranslationField`` based on a
-    fieldname and a language.
+    fieldname and a language, or a ``CompressedTranslationField`` if
+    ``compress`` is true.
 
     The list of supported fields can be extended by defining a tuple of field
     names in the projects settings.py like this::
@@ -28,9 +44,31 @@ def create_translation_field(model, field_name, lang):
             cls_name in settings.CUSTOM_FIELDS):
         raise ImproperlyConfigured('%s is not supported by '
                                    'modeltranslation.' % cls_name)
+    if compress:
+        if not isinstance(field, TextField):
+            raise ImproperlyConfigured(
+                'Only translations of a TextField can be compressed, %s.%s '
+                'is a %s.' % (model.__name__, field_name, cls_name))
+        return CompressedTranslationField(translated_field=field,
+                                          language=lang)
     return TranslationField(translated_field=field, language=lang)
 
 
+class Unchanged(object):
+    """
+    Returned by ``TranslationField.pre_save`` instead of the value of a
+    translation field which hasn't changed since the instance was loaded, if
+    the translation options of its model set ``track_changes``. Such columns
+    are left out of the UPDATE statement. ``original`` tells whether the
+    original field is unchanged as well.
+    """
+    def __init__(self, original=False):
+        self.original = original
+
+UNCHANGED = Unchanged()
+UNCHANGED_WITH_ORIGINAL = Unchanged(original=True)
+
+
 class TranslationField(Field):
     """
     The translation field functions as a proxy to the original field which is
@@ -48,7 +86,12 @@ class TranslationField(Field):
 
     The translation field needs to know which language it contains therefore
     that needs to be specified when the field is created.
+
+    If ``dedupe`` is set (see the ``dedupe`` translation option), a value
+    equal to the translation in the default language is stored as ``NULL``.
     """
+    dedupe = False
+
     def __init__(self, translated_field, language, *args, **kwargs):
         # Update the dict of this field with the content of the original one
         # This might be a bit radical?! Seems to work though...
@@ -79,13 +122,58 @@ class TranslationField(Field):
             translated_field.verbose_name, language)
 
     def pre_save(self, model_instance, add):
+        unchanged = None
+        snapshot = model_instance.__dict__.get('_translation_snapshot')
+        if (snapshot is not None and not add and
+                not model_instance._state.adding):
+            if self.attname not in model_instance.__dict__:
+                # A deferred translation field which was never loaded
+                return UNCHANGED
+            if (self.attname in snapshot and snapshot[self.attname] ==
+                    model_instance.__dict__[self.attname]):
+                unchanged = UNCHANGED
         val = super(TranslationField, self).pre_save(model_instance, add)
-        if settings.DEFAULT_LANGUAGE == self.language and not add:
-            # Rule is: 3. Assigning a value to a translation field of the
-            # default language also updates the original field
-            model_instance.__dict__[self.translated_field.attname] = val
+        if settings.DEFAULT_LANGUAGE == self.language:
+            original_name = self.translated_field.attname
+            if not add:
+                # The original field saves the value read through the
+                # descriptor, it's unchanged if that still is the loaded one
+                if (unchanged is not None and original_name in snapshot and
+                        snapshot[original_name] ==
+                        getattr(model_instance, original_name)):
+                    unchanged = UNCHANGED_WITH_ORIGINAL
+                # Rule is: 3. Assigning a value to a translation field of the
+                # default language also updates the original field
+                model_instance.__dict__[original_name] = val
+            elif val in (None, ''):
+                # Inserting a row (this includes bulk_create) stores the
+                # original value in the empty translation field of the default
+                # language, like update_translation_fields would do later on.
+                # The instance gets the value too, otherwise saving it again
+                # would store the empty translation in both fields.
+                val = model_instance.__dict__.get(original_name)
+                setattr(model_instance, self.attname, val)
+                return val
+        if unchanged is not None:
+            return unchanged
+        if (self.dedupe and val not in (None, '') and
+                val == self.get_default_translation(model_instance)):
+            return None
         return val
 
+    def get_default_translation(self, model_instance):
+        """
+        Returns the translation of ``model_instance`` in the default language,
+        which is the value of the original field if it's empty.
+        """
+        original_name = self.translated_field.attname
+        value = getattr(model_instance, get_localized_fieldname(
+            self.model, self.translated_field.name,
+            settings.DEFAULT_LANGUAGE))
+        if value in (None, ''):
+            value = model_instance.__dict__.get(original_name)
+        return value
+
     def get_prep_value(self, value):
         if value == '':
             value = None
@@ -122,22 +210,173 @@ class TranslationField(Field):
         return super(TranslationField, self).formfield(*args, **defaults)
 
 
+class CompressedTranslationField(TranslationField):
+    """
+    A translation field storing its value zlib compressed in a binary column,
+    used for the fields listed in the ``compress`` translation option.
+
+    Values loaded from the database are kept compressed in the instance and
+    only decompressed when the attribute is accessed first, see
+    ``CompressedValueDescriptor``. Compressed translations can't be looked up
+    by their content, only ``isnull`` lookups are supported.
+    """
+    compressed = True
+
+    db_types = {
+        'mysql': 'longblob',
+        'postgresql': 'bytea',
+    }
+
+    def contribute_to_class(self, cls, name):
+        super(CompressedTranslationField, self).contribute_to_class(cls, name)
+        setattr(cls, self.attname, CompressedValueDescriptor(self))
+
+    def db_type(self, connection):
+        return self.db_types.get(connection.vendor, 'BLOB')
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None:
+            return None
+        # The DB-API module of the backend wraps the binary data
+        database = import_module(connection.__module__).Database
+        return database.Binary(zlib.compress(smart_str(value, 'utf-8')))
+
+    def get_prep_lookup(self, lookup_type, value):
+        if lookup_type != 'isnull':
+            raise TypeError("Compressed translation field '%s' only supports "
+                            "isnull lookups." % self.name)
+        return super(CompressedTranslationField, self).get_prep_lookup(
+            lookup_type, value)
+
+    def get_db_prep_lookup(self, lookup_type, value, connection,
+                           prepared=False):
+        if not prepared:
+            value = self.get_prep_lookup(lookup_type, value)
+        return [value]
+
+    def to_python(self, value):
+        if value is None or isinstance(value, unicode):
+            return value
+        # Database drivers return binary columns as buffer or str
+        data = str(value)
+        try:
+            return zlib.decompress(data).decode('utf-8')
+        except zlib.error:
+            # A plain byte string assigned to the field
+            return smart_unicode(data)
+
+
+class CompressedValueDescriptor(object):
+    """
+    Keeps the compressed value of a ``CompressedTranslationField`` loaded
+    from the database until it is accessed, then decompresses it once.
+    """
+    def __init__(self, field):
+        self.field = field
+        self.raw_name = '_%s_compressed' % field.attname
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.field.attname]
+        except KeyError:
+            value = self.field.to_python(
+                instance.__dict__.pop(self.raw_name, None))
+            instance.__dict__[self.field.attname] = value
+            snapshot = instance.__dict__.get('_translation_snapshot')
+            if snapshot is not None:
+                # The loaded value, to tell whether it's changed on saving
+                snapshot.setdefault(self.field.attname, value)
+            return value
+
+    def __set__(self, instance, value):
+        if value is None or isinstance(value, unicode):
+            instance.__dict__.pop(self.raw_name, None)
+            instance.__dict__[self.field.attname] = value
+        else:
+            instance.__dict__.pop(self.field.attname, None)
+            instance.__dict__[self.raw_name] = value
+
+
+class TranslationStatusField(BooleanField):
+    """
+    Tells whether any of the translated fields ``field_names`` of an object
+    has a translation in ``language``, added for every language if the
+    translation options set ``translation_status``. The value is updated
+    whenever the object is saved and indexed, see
+    ``TranslationQuerySet.translated_into``.
+    """
+    def __init__(self, field_names, language, *args, **kwargs):
+        self.field_names = field_names
+        self.language = language
+        kwargs.update(default=False, editable=False, db_index=True)
+        super(TranslationStatusField, self).__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        names = [get_localized_fieldname(self.model, field_name,
+                                         self.language)
+                 for field_name in self.field_names]
+        values = model_instance.__dict__
+        snapshot = values.get('_translation_snapshot')
+        if (snapshot is not None and not add and
+                not model_instance._state.adding and
+                [name for name in names if name in snapshot and
+                 name in values and
+                 snapshot[name] == values[name]] == names):
+            # None of the translations was changed since loading
+            return UNCHANGED
+        value = bool([name for name in names
+                      if getattr(model_instance, name) not in (None, '')])
+        values[self.attname] = value
+        return value
+
+    def south_field_triple(self):
+        from south.modelsinspector import introspector
+        args, kwargs = introspector(self)
+        return ('django.db.models.fields.BooleanField', args, kwargs)
+
+
 class TranslationFieldDescriptor(object):
     """
     A descriptor used for the original translated field.
     """
-    def __init__(self, name, initial_val='', fallback_value=None):
+    def __init__(self, name, initial_val='', fallback_value=None,
+                 localized_fieldnames=None, dedupe=False):
         """
         The ``name`` is the name of the field (which is not available in the
         descriptor by default - this is Python behaviour).
+
+        If ``dedupe`` is set, empty translations fall back to the translation
+        in the default language before the ``fallback_value``, as deduplicated
+        translations equal to it are stored empty.
+
+        ``localized_fieldnames`` maps each language code to the attname of the
+        corresponding translation field. It is built once on registration, so
+        accessing the descriptor doesn't need to build the localized fieldname
+        on every call.
         """
         self.name = name
         self.val = initial_val
         self.fallback_value = fallback_value
+        self.dedupe = dedupe
+        if localized_fieldnames is None:
+            localized_fieldnames = dict(
+                (lang, build_localized_fieldname(name, lang))
+                for lang in settings.AVAILABLE_LANGUAGES)
+        self.localized_fieldnames = localized_fieldnames
 
     def __set__(self, instance, value):
-        lang = get_language()
-        loc_field_name = build_localized_fieldname(self.name, lang)
+        if self.name not in instance.__dict__:
+            # The instance is being populated by ``Model.__init__``, e.g. from
+            # a database row. The translation fields are assigned after the
+            # original field anyway, so only store the original value. This
+            # also keeps deferred translation fields from being overwritten.
+            instance.__dict__[self.name] = value
+            return
+        loc_field_name = self.localized_fieldnames[get_language()]
         # also update the translation field of the current language
         setattr(instance, loc_field_name, value)
         # update the original field via the __dict__ to prevent calling the
@@ -145,18 +384,26 @@ class TranslationFieldDescriptor(object):
         instance.__dict__[self.name] = value
 
     def __get__(self, instance, owner):
-        if not instance:
+        if instance is None:
             raise ValueError(u"Translation field '%s' can only be accessed "
                               "via an instance not via a class." % self.name)
-        loc_field_name = build_localized_fieldname(
-            self.name, get_language())
-        if hasattr(instance, loc_field_name):
-            if getattr(instance, loc_field_name):
-                return getattr(instance, loc_field_name)
-            elif self.fallback_value is None:
-                return self.get_default_instance(instance)
-            else:
-                return self.fallback_value
+        loc_field_name = self.localized_fieldnames[get_language()]
+        try:
+            val = instance.__dict__[loc_field_name]
+        except KeyError:
+            # The translation field is deferred, let the model load it
+            val = getattr(instance, loc_field_name)
+        if val:
+            return val
+        if self.dedupe:
+            val = getattr(instance,
+                          self.localized_fieldnames[settings.DEFAULT_LANGUAGE])
+            if val:
+                return val
+        if self.fallback_value is None:
+            return self.get_default_instance(instance)
+        else:
+            return self.fallback_value
 
     def get_default_instance(self, instance):
         """
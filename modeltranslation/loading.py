@@ -1,4 +1,36 @@
 # -*- coding: utf-8 -*-
+import threading
+
+
+class AppTiming(object):
+    """
+    What importing the translation module of an app took during the last
+    ``autodiscover``:
+
+    ``app``
+        The name of the app in ``INSTALLED_APPS``.
+    ``found``
+        Whether the app has a translation module.
+    ``import_time``
+        Seconds importing the app and its translation module took.
+    ``registered``
+        Number of models the translation module registered.
+    ``journal_time``
+        Seconds spent on recording the registrations to roll them back if
+        the import fails (and on rolling them back).
+    """
+    def __init__(self, app, found=False, import_time=0.0, registered=0,
+                 journal_time=0.0):
+        self.app = app
+        self.found = found
+        self.import_time = import_time
+        self.registered = registered
+        self.journal_time = journal_time
+
+
+# The AppTiming of every app in INSTALLED_APPS, in the order of the last
+# autodiscover
+autodiscover_timings = []
 
 
 def autodiscover():
@@ -6,34 +38,61 @@ def autodiscover():
     Auto-discover INSTALLED_APPS translation.py modules and fail silently when
     not present. This forces an import on them to register.
     Also import explicit modules.
+
+    How long each app took is kept in ``autodiscover_timings``.
     """
     import os
     import sys
-    import copy
+    import time
     from django.conf import settings
     from django.utils.importlib import import_module
     from django.utils.module_loading import module_has_submodule
     from modeltranslation.translator import translator
     from modeltranslation.settings import DEBUG
 
-    for app in settings.INSTALLED_APPS:
-        mod = import_module(app)
-        # Attempt to import the app's translation module.
-        module = '%s.translations' % app
-        before_import_registry = copy.copy(translator._registry)
-        try:
-            import_module(module)
-        except:
-            # Reset the model registry to the state before the last import as
-            # this import will have to reoccur on the next request and this
-            # could raise NotRegistered and AlreadyRegistered exceptions
-            translator._registry = before_import_registry
-
-            # Decide whether to bubble up this error. If the app just
-            # doesn't have an translation module, we can ignore the error
-            # attempting to import it, otherwise we want it to bubble up.
-            if module_has_submodule(mod, 'translations'):
-                raise
+    timings = []
+    try:
+        # Register all translation options in one batch, which deletes the
+        # field caches of the related models only once
+        with translator.batch():
+            for app in settings.INSTALLED_APPS:
+                timing = AppTiming(app)
+                timings.append(timing)
+                started = time.time()
+                mod = import_module(app)
+                # Attempt to import the app's translation module.
+                module = '%s.translations' % app
+                journal_started = time.time()
+                journal = translator.start_journal()
+                timing.journal_time = time.time() - journal_started
+                try:
+                    import_module(module)
+                except:
+                    # Reset the model registry to the state before the last
+                    # import as this import will have to reoccur on the next
+                    # request and this could raise NotRegistered and
+                    # AlreadyRegistered exceptions
+                    journal_started = time.time()
+                    translator.end_journal(journal, rollback=True)
+                    timing.journal_time += time.time() - journal_started
+                    timing.import_time = time.time() - started
+
+                    # Decide whether to bubble up this error. If the app just
+                    # doesn't have an translation module, we can ignore the
+                    # error attempting to import it, otherwise we want it to
+                    # bubble up.
+                    if module_has_submodule(mod, 'translations'):
+                        raise
+                else:
+                    journal_started = time.time()
+                    translator.end_journal(journal)
+                    timing.journal_time += time.time() - journal_started
+                    timing.import_time = time.time() - started
+                    timing.found = True
+                    timing.registered = len(
+                        [entry for entry in journal if entry[1] is None])
+    finally:
+        autodiscover_timings[:] = timings
 
     # In debug mode, print a list of registered models and pid to stdout.
     # Note: Differing model order is fine, _registry is just a dict and we
@@ -51,6 +110,19 @@ def autodiscover():
             pass
 
 
+class _RegistrationState(object):
+    """
+    Whether the translation registrations have been handled, see
+    ``handle_translation_registrations``.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.running = False
+        self.done = False
+
+_registration_state = _RegistrationState()
+
+
 def handle_translation_registrations(*args, **kwargs):
     """
     Ensures that any configuration of the TranslationOption(s) are handled when
@@ -59,7 +131,6 @@ def handle_translation_registrations(*args, **kwargs):
     This makes it possible for scripts/management commands that affect models
     but know nothing of modeltranslation.
     """
-    import inspect
     from modeltranslation import settings
 
     if not settings.ENABLE_REGISTRATIONS:
@@ -69,17 +140,27 @@ def handle_translation_registrations(*args, **kwargs):
         # part to make things work.
         return
 
-    # This is a little dirty but we need to run the code that follows only
-    # once, no matter how many times the main modeltranslation module is
-    # imported. We'll look through the stack to see if we appear anywhere and
-    # simply return if we do, allowing the original call to finish.
-    stack = inspect.stack()
-
-    for stack_info in stack[1:]:
-        if 'handle_translation_registrations' in stack_info[3] \
-            and __file__ == stack_info[2]:
+    # We need to run the code that follows only once, no matter how many
+    # times the main modeltranslation module is imported. Other threads wait
+    # for the first call to finish, while calls from within it (the
+    # translation modules importing modeltranslation again) simply return,
+    # allowing the original call to finish. If the first call fails, the
+    # next one tries again.
+    state = _registration_state
+    if state.done:
+        return
+    with state.lock:
+        if state.done or state.running:
             return
+        state.running = True
+        try:
+            # Trigger autodiscover, causing any TranslationOption
+            # initialization code to execute.
+            autodiscover()
 
-    # Trigger autodiscover, causing any TranslationOption initialization
-    # code to execute.
-    autodiscover()
+            # Compile the lookup tables of the registered models up front
+            from modeltranslation.translator import translator
+            translator.freeze()
+            state.done = True
+        finally:
+            state.running = False
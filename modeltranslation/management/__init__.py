@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from django.core.management.color import no_style
+from django.db import connections, transaction, DEFAULT_DB_ALIAS
+from django.db.models import get_models, signals
+
+
+def get_table_indexes(cursor, connection, db_table):
+    """
+    Returns the names of the indexes of ``db_table``.
+    """
+    if connection.vendor == 'sqlite':
+        cursor.execute("SELECT name FROM sqlite_master "
+                       "WHERE type = 'index' AND tbl_name = %s", [db_table])
+    elif connection.vendor == 'postgresql':
+        cursor.execute("SELECT indexname FROM pg_indexes "
+                       "WHERE tablename = %s", [db_table])
+    elif connection.vendor == 'mysql':
+        cursor.execute(
+            "SHOW INDEX FROM %s" % connection.ops.quote_name(db_table))
+        return [row[2] for row in cursor.fetchall()]
+    else:
+        return []
+    return [row[0] for row in cursor.fetchall()]
+
+
+def create_translation_indexes(app, created_models, verbosity=2,
+                               db=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Creates the indexes declared in the translation options of the models
+    which have just been created by syncdb. Indexes which already exist are
+    skipped, as flush emits the signal for all models again.
+    """
+    from modeltranslation.translator import (translator, NotRegistered,
+                                             sql_translation_indexes)
+    connection = connections[db]
+    cursor = connection.cursor()
+    style = no_style()
+    for model in get_models(app):
+        if model not in created_models:
+            continue
+        try:
+            translator.get_options_for_model(model)
+        except NotRegistered:
+            continue
+        statements = sql_translation_indexes(model, style, connection)
+        for name in get_table_indexes(cursor, connection,
+                                      model._meta.db_table):
+            statements.pop(name, None)
+        if statements and verbosity >= 1:
+            print 'Installing translation indexes for %s.%s model' % (
+                model._meta.app_label, model._meta.object_name)
+        for name, sql in sorted(statements.items()):
+            cursor.execute(sql)
+    transaction.commit_unless_managed(using=db)
+
+signals.post_syncdb.connect(
+    create_translation_indexes,
+    dispatch_uid="modeltranslation.management.create_translation_indexes")
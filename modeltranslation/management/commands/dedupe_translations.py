@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Stores the translations which equal the translation in the default language
+as ``NULL``, for the models whose translation options set ``dedupe``. New
+translations are deduplicated when saved, this command cleans up the
+existing rows.
+"""
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils.encoding import smart_str
+
+from modeltranslation import settings as mt_settings
+from modeltranslation.storage import is_deduplicated
+from modeltranslation.translator import translator
+
+
+class Command(NoArgsCommand):
+    help = ('Stores translations equal to the translation in the default '
+            'language as NULL for models with the dedupe option.')
+    option_list = NoArgsCommand.option_list + (
+        make_option('--chunk-size', type='int', dest='chunk_size',
+                    default=1000,
+                    help='Number of rows updated at once (default: 1000).'),
+    )
+
+    def handle_noargs(self, **options):
+        chunk_size = options.get('chunk_size', 1000)
+        verbosity = int(options.get('verbosity', 1))
+        total = 0
+        for model, trans_opts in translator._registry.items():
+            if model._meta.abstract:
+                continue
+            columns = self.get_columns(model, trans_opts)
+            if not columns:
+                continue
+            saved = self.dedupe_model(model, columns, chunk_size)
+            total += saved
+            if verbosity:
+                print "%s.%s: %d bytes saved" % (
+                    model._meta.app_label, model._meta.object_name, saved)
+        if verbosity:
+            print "Total: %d bytes saved" % total
+
+    def get_columns(self, model, trans_opts):
+        """
+        Returns ``(name, default_name)`` tuples of the deduplicated
+        translation fields of ``model`` and the translation field of the
+        default language they are compared to.
+        """
+        columns = []
+        default = mt_settings.DEFAULT_LANGUAGE
+        for field_name in trans_opts.fields:
+            if not is_deduplicated(trans_opts, field_name):
+                continue
+            storages = trans_opts.storages[field_name]
+            if not storages[default].concrete:
+                continue
+            for lang, lang_name in settings.LANGUAGES:
+                if lang != default and storages[lang].concrete:
+                    columns.append((
+                        translator.get_localized_fieldname(
+                            model, field_name, lang),
+                        translator.get_localized_fieldname(
+                            model, field_name, default)))
+        return columns
+
+    def dedupe_model(self, model, columns, chunk_size):
+        """
+        Deduplicates ``columns`` of ``model`` in chunks of ``chunk_size``
+        rows and returns the number of bytes saved.
+        """
+        manager = model._base_manager
+        saved = 0
+        last_pk = None
+        while True:
+            rows = manager.order_by('pk')
+            if last_pk is not None:
+                rows = rows.filter(pk__gt=last_pk)
+            pks = list(rows.values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            for name, default_name in columns:
+                field = model._meta.get_field(name)
+                if getattr(field, 'compressed', False):
+                    saved += self.dedupe_compressed(
+                        manager, pks, field, default_name)
+                    continue
+                duplicates = manager.filter(pk__in=pks, **{
+                    name: F(default_name)}).exclude(**{name: ''})
+                saved += sum(len(smart_str(value)) for value in
+                             duplicates.values_list(name, flat=True))
+                duplicates.update(**{name: None})
+            transaction.commit_unless_managed()
+        return saved
+
+    def dedupe_compressed(self, manager, pks, field, default_name):
+        """
+        Deduplicates the compressed translation field ``field`` of the rows
+        ``pks``. Compressed translations can't be compared by the database,
+        they are decompressed and compared here instead.
+        """
+        default_field = field.model._meta.get_field(default_name)
+        saved = 0
+        duplicates = []
+        for pk, raw, default_raw in manager.filter(pk__in=pks).values_list(
+                'pk', field.name, default_name):
+            value = field.to_python(raw)
+            if (value not in (None, '') and
+                    value == default_field.to_python(default_raw)):
+                duplicates.append(pk)
+                saved += len(smart_str(raw))
+        if duplicates:
+            manager.filter(pk__in=duplicates).update(**{field.name: None})
+        return saved
@@ -6,6 +6,10 @@ You will need to execute this command in two cases:
 
     1. When you add new languages to settings.LANGUAGES.
     2. When you add new translatable fields to your models.
+    3. When you change the indexes declared in the translation options.
+
+With ``--triggers`` it also installs database triggers keeping the original
+fields and the translation fields of the default language in sync.
 
 Credits: Heavily inspired by django-transmeta's sync_transmeta_db command.
 """
@@ -15,10 +19,13 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.core.management.color import no_style
 from django.db import connection, transaction
+from django.db.backends.util import truncate_name
 from django.db.models import get_models
 
-from modeltranslation.translator import translator, NotRegistered
-from modeltranslation.utils import build_localized_fieldname
+from modeltranslation.management import get_table_indexes
+from modeltranslation.translator import (translator, NotRegistered,
+                                         sql_translation_indexes,
+                                         sql_translation_triggers)
 
 
 def ask_for_confirmation(sql_sentences, model_full_name):
@@ -39,9 +46,9 @@ def ask_for_confirmation(sql_sentences, model_full_name):
             return False
 
 
-def print_missing_langs(missing_langs, field_name, model_name):
-    print 'Missing languages in "%s" field from "%s" model: %s' % (
-        field_name, model_name, ", ".join(missing_langs))
+def print_missing_columns(missing_columns, field_name, model_name):
+    print 'Missing columns in "%s" field from "%s" model: %s' % (
+        field_name, model_name, ", ".join(missing_columns))
 
 
 class Command(BaseCommand):
@@ -51,6 +58,10 @@ class Command(BaseCommand):
         make_option('--noinput', action='store_false', dest='interactive', default=True,
             help='If provided, no prompts will be issued to the user and the database will be updated.'
         ),
+        make_option('--triggers', action='store_true', dest='triggers',
+            default=False,
+            help='Install database triggers keeping the original fields in sync with the translation fields of the default language.'
+        ),
     )
 
     def handle(self, *args, **options):
@@ -61,6 +72,7 @@ class Command(BaseCommand):
         self.introspection = connection.introspection
         self.verbosity = int(options.get('verbosity', 1))
         self.interactive = options.get('interactive', True)
+        self.triggers = options.get('triggers', False)
 
         all_models = get_models()
         found_missing_fields = False
@@ -76,17 +88,32 @@ class Command(BaseCommand):
                                        if field in local_field_names]
                 model_full_name = '%s.%s' % (model._meta.app_label,
                                              model._meta.module_name)
-                db_table = model._meta.db_table
                 for field_name in translatable_fields:
-                    missing_langs = list(
-                        self.get_missing_languages(field_name, db_table))
-                    if missing_langs:
+                    missing_fields = list(
+                        self.get_missing_fields(field_name, model))
+                    if missing_fields:
                         found_missing_fields = True
                         if self.verbosity:
-                            print_missing_langs(
-                                missing_langs, field_name, model_full_name)
+                            print_missing_columns(
+                                [f.column for f in missing_fields],
+                                field_name, model_full_name)
                         sql_sentences = self.get_sync_sql(
-                            field_name, missing_langs, model)
+                            missing_fields, model)
+                        if (not self.interactive or
+                            ask_for_confirmation(sql_sentences, model_full_name)):
+                            if self.verbosity:
+                                print 'Executing SQL...',
+                            for sentence in sql_sentences:
+                                self.cursor.execute(sentence)
+                            if self.verbosity:
+                                print 'Done'
+                        else:
+                            print 'SQL not executed'
+                if getattr(options, 'indexes', None) is not None:
+                    sql_sentences = self.get_index_sync_sql(
+                        model, translatable_fields)
+                    if sql_sentences:
+                        found_missing_fields = True
                         if (not self.interactive or
                             ask_for_confirmation(sql_sentences, model_full_name)):
                             if self.verbosity:
@@ -97,13 +124,32 @@ class Command(BaseCommand):
                                 print 'Done'
                         else:
                             print 'SQL not executed'
+                if self.triggers and not model._meta.proxy:
+                    sql_sentences = sql_translation_triggers(
+                        model, no_style(), connection)
+                    if sql_sentences is None:
+                        print ('Database triggers are not supported by the '
+                               '%s backend' % connection.vendor)
+                        self.triggers = False
+                    elif sql_sentences and (
+                            not self.interactive or
+                            ask_for_confirmation(sql_sentences,
+                                                 model_full_name)):
+                        if self.verbosity:
+                            print 'Executing SQL...',
+                        for sentence in sql_sentences:
+                            self.cursor.execute(sentence)
+                        if self.verbosity:
+                            print 'Done'
+                    elif sql_sentences:
+                        print 'SQL not executed'
             except NotRegistered:
                 pass
 
         transaction.commit_unless_managed()
 
         if not found_missing_fields and self.verbosity:
-            print 'No new translatable fields detected'
+            print 'No new translatable fields or indexes detected'
 
     def get_table_fields(self, db_table):
         """
@@ -113,27 +159,41 @@ class Command(BaseCommand):
             self.cursor, db_table)
         return [t[0] for t in db_table_desc]
 
-    def get_missing_languages(self, field_name, db_table):
+    def get_missing_fields(self, field_name, model):
         """
-        Gets only missings fields.
+        Gets only missings fields, which are the translation fields or the
+        other columns the storages of the translations need. Columns of tables
+        which don't exist yet are left to syncdb.
         """
-        db_table_fields = self.get_table_fields(db_table)
+        table_names = self.introspection.table_names()
+        table_fields = {}
+        storages = translator.get_options_for_model(model).storages[
+            field_name]
+        seen = []
         for lang_code, lang_name in settings.LANGUAGES:
-            if build_localized_fieldname(
-                field_name, lang_code) not in db_table_fields:
-                yield lang_code
-
-    def get_sync_sql(self, field_name, missing_langs, model):
+            storage = storages[lang_code]
+            if storage in seen:
+                continue
+            seen.append(storage)
+            for f in storage.get_fields():
+                db_table = f.model._meta.db_table
+                if db_table not in table_names:
+                    continue
+                if db_table not in table_fields:
+                    table_fields[db_table] = self.get_table_fields(db_table)
+                if f.column not in table_fields[db_table]:
+                    yield f
+
+    def get_sync_sql(self, missing_fields, model):
         """
         Returns SQL needed for sync schema for a new translatable field.
         """
         qn = connection.ops.quote_name
         style = no_style()
         sql_output = []
-        db_table = model._meta.db_table
-        for lang in missing_langs:
-            new_field = build_localized_fieldname(field_name, lang)
-            f = model._meta.get_field(new_field)
+        for f in missing_fields:
+            # The column might belong to a table of the storage
+            db_table = f.model._meta.db_table
             col_type = f.db_type(connection)
             field_sql = [style.SQL_FIELD(qn(f.column)),
                          style.SQL_COLTYPE(col_type)]
@@ -141,8 +201,45 @@ class Command(BaseCommand):
             sql_output.append(
                 "ALTER TABLE %s ADD COLUMN %s;" % (
                     qn(db_table), ' '.join(field_sql)))
-            if not f.null and lang == settings.LANGUAGE_CODE:
+            if (not f.null and
+                getattr(f, 'language', None) == settings.LANGUAGE_CODE):
                 sql_output.append("ALTER TABLE %s MODIFY COLUMN %s %s %s;" % \
                                   (qn(db_table), qn(f.column), col_type,
                                   style.SQL_KEYWORD('NOT NULL')))
         return sql_output
+
+    def get_index_sync_sql(self, model, translatable_fields):
+        """
+        Returns SQL needed to create the indexes declared in the translation
+        options of a model and to drop the indexes Django creates for
+        translation fields with ``db_index`` which aren't declared.
+        """
+        qn = connection.ops.quote_name
+        style = no_style()
+        sql_output = []
+        db_table = model._meta.db_table
+        existing = get_table_indexes(self.cursor, connection, db_table)
+        declared = sql_translation_indexes(model, style, connection)
+        for name, sql in sorted(declared.items()):
+            if name not in existing:
+                sql_output.append(sql)
+        storages = translator.get_options_for_model(model).storages
+        for field_name in translatable_fields:
+            original = model._meta.get_field(field_name)
+            if not original.db_index:
+                continue
+            for lang_code, lang_name in settings.LANGUAGES:
+                if not storages[field_name][lang_code].concrete:
+                    continue
+                f = model._meta.get_field(translator.get_localized_fieldname(
+                    model, field_name, lang_code))
+                name = truncate_name(
+                    '%s_%s' % (db_table, connection.creation._digest(f.column)),
+                    connection.ops.max_name_length())
+                if name in existing and name not in declared:
+                    if connection.vendor == 'mysql':
+                        sql_output.append('DROP INDEX %s ON %s;' % (
+                            qn(name), qn(db_table)))
+                    else:
+                        sql_output.append('DROP INDEX %s;' % qn(name))
+        return sql_output
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Prints how long importing the translation module of each app took when
+modeltranslation discovered them on startup, to find the apps which slow
+down booting a worker.
+"""
+from django.core.management.base import NoArgsCommand
+
+from modeltranslation import loading
+
+
+class Command(NoArgsCommand):
+    help = ('Prints the time importing the translation module of each app '
+            'took on startup and the number of models it registered.')
+
+    def handle_noargs(self, **options):
+        timings = loading.autodiscover_timings
+        if not timings:
+            print ('The translation modules have not been discovered, see '
+                   'MODELTRANSLATION_ENABLE_REGISTRATIONS.')
+            return
+        print '%-40s %10s %10s %10s' % ('App', 'Import ms', 'Models',
+                                        'Journal ms')
+        for timing in sorted(timings, key=lambda t: -t.import_time):
+            print '%-40s %10.2f %10s %10.3f' % (
+                timing.app, timing.import_time * 1000,
+                timing.found and timing.registered or '-',
+                timing.journal_time * 1000)
+        print '%-40s %10.2f %10d %10.3f' % (
+            'Total', sum(t.import_time for t in timings) * 1000,
+            sum(t.registered for t in timings),
+            sum(t.journal_time for t in timings) * 1000)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Counts the translations in every language of all models registered for
+translation, to help choosing the ``hot_languages`` of their translation
+options.
+"""
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import NoArgsCommand
+
+from modeltranslation.manager import get_compressed_field
+from modeltranslation.translator import translator
+
+
+def count_translations(model, field_name, lang):
+    """
+    Returns the number of objects of ``model`` with a translation of
+    ``field_name`` in ``lang``. Compressed translations only support
+    ``isnull`` lookups, so empty ones are counted too.
+    """
+    name = translator.get_localized_fieldname(model, field_name, lang)
+    qs = model._default_manager.filter(**{'%s__isnull' % name: False})
+    if get_compressed_field(model, field_name, lang) is None:
+        qs = qs.exclude(**{name: ''})
+    return qs.count()
+
+
+class Command(NoArgsCommand):
+    help = ('Counts the translations of all translated models per language '
+            'and suggests the hot languages of each model.')
+    option_list = NoArgsCommand.option_list + (
+        make_option('--threshold', type='float', dest='threshold',
+                    default=10.0,
+                    help='Percentage of objects translated into a language '
+                         'from which on the language is suggested as hot '
+                         '(default: 10).'),
+    )
+
+    def handle_noargs(self, **options):
+        threshold = options.get('threshold', 10.0)
+        verbosity = int(options.get('verbosity', 1))
+        languages = [l[0] for l in settings.LANGUAGES]
+        for model, trans_opts in translator._registry.items():
+            if model._meta.abstract:
+                continue
+            total = model._default_manager.count()
+            if verbosity:
+                print "%s.%s (%d objects)" % (
+                    model._meta.app_label, model._meta.object_name, total)
+            hot_languages = []
+            for lang in languages:
+                counts = [count_translations(model, field_name, lang)
+                          for field_name in trans_opts.fields]
+                if verbosity:
+                    print '  %s: %s' % (lang, ', '.join(
+                        '%s %d' % (field_name, count) for field_name, count
+                        in zip(trans_opts.fields, counts)))
+                if total and max(counts) * 100.0 / total >= threshold:
+                    hot_languages.append(lang)
+            if verbosity:
+                print '  hot_languages = %r' % (tuple(hot_languages),)
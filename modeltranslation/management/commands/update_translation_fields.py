@@ -4,7 +4,6 @@ from django.core.management.base import NoArgsCommand
 
 from modeltranslation.settings import DEFAULT_LANGUAGE
 from modeltranslation.translator import translator
-from modeltranslation.utils import build_localized_fieldname
 
 
 class Command(NoArgsCommand):
@@ -16,8 +15,8 @@ class Command(NoArgsCommand):
         for model, trans_opts in translator._registry.items():
             print "Updating data of model '%s'" % model
             for fieldname in trans_opts.fields:
-                def_lang_fieldname = build_localized_fieldname(
-                    fieldname, DEFAULT_LANGUAGE)
+                def_lang_fieldname = translator.get_localized_fieldname(
+                    model, fieldname, DEFAULT_LANGUAGE)
                 # We'll only update fields which do not have an existing value
                 model.objects.filter(
                     Q(**{def_lang_fieldname: None}) |
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Recomputes the translation status fields of the models whose translation
+options set ``translation_status``, e.g. after enabling the option or after
+changing translations bypassing the ORM.
+"""
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+
+from modeltranslation.translator import translator
+
+
+class Command(NoArgsCommand):
+    help = ('Recomputes the translation status fields of all models with '
+            'the translation_status option.')
+    option_list = NoArgsCommand.option_list + (
+        make_option('--chunk-size', type='int', dest='chunk_size',
+                    default=1000,
+                    help='Number of rows updated at once (default: 1000).'),
+    )
+
+    def handle_noargs(self, **options):
+        chunk_size = options.get('chunk_size', 1000)
+        verbosity = int(options.get('verbosity', 1))
+        for model, trans_opts in translator._registry.items():
+            if (model._meta.abstract or
+                    not getattr(trans_opts, 'translation_status', False)):
+                continue
+            if verbosity:
+                print "Updating translation status of model '%s'" % model
+            queryset = model._default_manager.order_by('pk')
+            last_pk = None
+            while True:
+                rows = queryset
+                if last_pk is not None:
+                    rows = rows.filter(pk__gt=last_pk)
+                pks = list(rows.values_list('pk', flat=True)[:chunk_size])
+                if not pks:
+                    break
+                last_pk = pks[-1]
+                queryset.filter(pk__in=pks).update_translation_status()
+                transaction.commit_unless_managed()
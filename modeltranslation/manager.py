@@ -0,0 +1,917 @@
+# -*- coding: utf-8 -*-
+"""
+Managers and querysets for models registered for translation.
+
+On registration the managers of the model are patched to derive from
+``TranslationManager``, which in turn returns querysets deriving from
+``TranslationQuerySet``. Custom manager and queryset classes keep working as
+the translation classes are mixed into them.
+"""
+import operator
+from copy import copy
+
+from django.db import connections
+from django.db.models.fields import CharField, TextField, FieldDoesNotExist
+from django.db.models.manager import Manager
+from django.db.models.query_utils import Q
+from django.db.models.query import (QuerySet, EmptyQuerySet, DateQuerySet,
+                                    ValuesQuerySet, ValuesListQuerySet,
+                                    ITER_CHUNK_SIZE)
+from django.db.models.sql.constants import LOOKUP_SEP
+from django.utils.datastructures import SortedDict
+from django.utils.encoding import force_unicode
+from django.utils.translation import override
+
+from modeltranslation import settings
+from modeltranslation.fields import Unchanged, get_localized_fieldname
+from modeltranslation.storage import get_translation_tables
+from modeltranslation.utils import get_language, build_localized_fieldname
+
+
+_mixed_classes = {}
+
+
+def _mix_class(mixin, cls):
+    """
+    Returns a subclass of ``cls`` which derives from ``mixin`` first.
+    """
+    if issubclass(cls, mixin):
+        return cls
+    try:
+        return _mixed_classes[(mixin, cls)]
+    except KeyError:
+        def __reduce__(self):
+            # The mixed class can't be looked up by its name, so instances
+            # are pickled with the classes it is mixed from
+            if hasattr(self, '__getstate__'):
+                state = self.__getstate__()
+            else:
+                state = self.__dict__
+            return _unpickle_mixed, (mixin, cls), state
+
+        mixed = type('Translation%s' % cls.__name__, (mixin, cls),
+                     {'__module__': cls.__module__, '__reduce__': __reduce__})
+        _mixed_classes[(mixin, cls)] = mixed
+        return mixed
+
+
+def _unpickle_mixed(mixin, cls):
+    """
+    Returns an empty instance of the class mixed from ``mixin`` and ``cls``,
+    whose state is restored by unpickling.
+    """
+    mixed = _mix_class(mixin, cls)
+    return mixed.__new__(mixed)
+
+
+def get_translation_options(model):
+    """
+    Returns the translation options for ``model`` or ``None`` if the model is
+    not registered for translation.
+    """
+    # Imported here to avoid a circular import with the translator module.
+    from modeltranslation.translator import translator, NotRegistered
+    try:
+        return translator.get_options_for_model(model)
+    except NotRegistered:
+        return None
+
+
+def get_translated_fields(model):
+    """
+    Returns the names of the translated fields of ``model``, including the
+    ones inherited from parent models registered for translation.
+    """
+    from modeltranslation.translator import translator
+    return translator.get_translated_fields(model)
+
+
+def get_translation_descriptor(model, field_name):
+    """
+    Returns the ``TranslationFieldDescriptor`` of ``field_name``, which might
+    have been installed on a parent of ``model``.
+    """
+    for klass in model.__mro__:
+        if field_name in klass.__dict__:
+            return klass.__dict__[field_name]
+
+
+def get_translation_storage(model, field_name, lang):
+    """
+    Returns the storage of the translation of ``field_name`` in ``lang``,
+    which might be a field of a parent of ``model``.
+    """
+    from modeltranslation.translator import translator
+    for klass in [model] + list(model._meta.get_parent_list()):
+        opts = translator._registry.get(klass)
+        if opts is not None and field_name in opts.fields:
+            return opts.storages[field_name][lang]
+
+
+def get_compressed_field(model, field_name, lang):
+    """
+    Returns the translation field of ``field_name`` in ``lang`` if it's a
+    ``CompressedTranslationField``, otherwise ``None``.
+    """
+    if not get_translation_storage(model, field_name, lang).concrete:
+        return None
+    field = model._meta.get_field(
+        get_localized_fieldname(model, field_name, lang))
+    if getattr(field, 'compressed', False):
+        return field
+    return None
+
+
+def split_localized_name(model, name):
+    """
+    Returns a ``(field_name, lang)`` tuple if ``name`` is the localized
+    attribute of a translated field of ``model``, otherwise ``None``.
+    """
+    from modeltranslation.translator import translator
+    return translator.split_localized_fieldname(model, name)
+
+
+def rewrite_lookup_key(model, lookup_key, lang=None):
+    """
+    Rewrites a lookup like ``title__startswith`` to the translation field of
+    ``lang`` (defaults to the current language), e.g.
+    ``title_de__startswith``. Lookups spanning relations are followed into
+    the related models.
+    """
+    pieces = lookup_key.split(LOOKUP_SEP)
+    for i, piece in enumerate(pieces):
+        if piece in get_translated_fields(model):
+            pieces[i] = get_localized_fieldname(
+                model, piece, lang or get_language())
+            return LOOKUP_SEP.join(pieces)
+        try:
+            field, m, direct, m2m = model._meta.get_field_by_name(piece)
+        except FieldDoesNotExist:
+            break
+        if not direct:
+            # Reverse relation
+            model = field.model
+        elif field.rel:
+            model = field.rel.to
+        else:
+            break
+    return lookup_key
+
+
+def rewrite_lookup(model, lookup_key, value, lang=None, translated=True):
+    """
+    Like ``rewrite_lookup_key``, but also compiles lookups on translations
+    which aren't stored in columns (see ``modeltranslation.storage``).
+    Returns the rewritten ``(lookup_key, value)`` tuple, or a ``Q`` object if
+    the storage needs one for the lookup. Lookups on translated fields are
+    left unchanged unless ``translated`` is true, or if the translation is
+    compressed and can't be compared.
+    """
+    lang = lang or get_language()
+    pieces = lookup_key.split(LOOKUP_SEP)
+    for i, piece in enumerate(pieces):
+        if translated and piece in get_translated_fields(model):
+            if get_compressed_field(model, piece, lang) is not None:
+                # The original field isn't compressed
+                break
+            translation = piece, lang
+        else:
+            try:
+                field, m, direct, m2m = model._meta.get_field_by_name(piece)
+            except FieldDoesNotExist:
+                translation = split_localized_name(model, piece)
+                if translation is None:
+                    break
+            else:
+                if not direct:
+                    # Reverse relation
+                    model = field.model
+                elif field.rel:
+                    model = field.rel.to
+                else:
+                    break
+                continue
+        storage = get_translation_storage(model, *translation)
+        if storage.concrete:
+            pieces[i] = get_localized_fieldname(model, *translation)
+            return LOOKUP_SEP.join(pieces), value
+        lookup = storage.lookup(
+            translation[1], LOOKUP_SEP.join(pieces[i + 1:]) or 'exact', value)
+        if isinstance(lookup, Q):
+            return prefix_q(lookup, pieces[:i])
+        key, value = lookup
+        return LOOKUP_SEP.join(pieces[:i] + [key]), value
+    return lookup_key, value
+
+
+def prefix_q(q, pieces):
+    """
+    Returns a copy of the ``Q`` object ``q`` with the lookups prefixed by the
+    relation path ``pieces``.
+    """
+    if not pieces:
+        return q
+    q = copy(q)
+    children = []
+    for child in q.children:
+        if isinstance(child, tuple):
+            child = LOOKUP_SEP.join(pieces + [child[0]]), child[1]
+        else:
+            child = prefix_q(child, pieces)
+        children.append(child)
+    q.children = children
+    return q
+
+
+def rewrite_q(model, q, lang=None, translated=True):
+    """
+    Returns a copy of the ``Q`` object ``q`` with all lookups rewritten by
+    ``rewrite_lookup``.
+    """
+    if isinstance(q, tuple):
+        return rewrite_lookup(model, q[0], q[1], lang, translated)
+    q = copy(q)
+    q.children = [rewrite_q(model, child, lang, translated)
+                  for child in q.children]
+    return q
+
+
+class TranslationQuerySet(QuerySet):
+    """
+    A queryset which knows about the translation fields of its model.
+
+    Ordering on translated fields is rewritten to the translation field of
+    the current language, lookups only on querysets of the
+    ``CurrentLanguageManager``.
+    """
+    # Whether to resolve fallbacks in the database, see ``with_fallbacks``
+    _fallbacks = False
+    # Whether lookups on translated fields query the translation field of
+    # the current language, see ``CurrentLanguageManager``
+    _rewrite_lookups = False
+
+    def _clone(self, klass=None, setup=False, **kwargs):
+        if klass is not None and not issubclass(klass, EmptyQuerySet):
+            # Keep querysets returned by e.g. ``values`` translation aware
+            klass = _mix_class(TranslationQuerySet, klass)
+        kwargs.setdefault('_fallbacks', self._fallbacks)
+        kwargs.setdefault('_rewrite_lookups', self._rewrite_lookups)
+        return super(TranslationQuerySet, self)._clone(klass, setup, **kwargs)
+
+    def _filter_or_exclude(self, negate, *args, **kwargs):
+        lang = get_language()
+        translated = self._rewrite_lookups
+        args = [rewrite_q(self.model, q, lang, translated) for q in args]
+        lookups = kwargs
+        kwargs = {}
+        for key, value in lookups.items():
+            lookup = rewrite_lookup(self.model, key, value, lang, translated)
+            if isinstance(lookup, Q):
+                args.append(lookup)
+            else:
+                kwargs[lookup[0]] = lookup[1]
+        return super(TranslationQuerySet, self)._filter_or_exclude(
+            negate, *args, **kwargs)
+
+    def with_fallbacks(self, enabled=True):
+        """
+        Makes ordering by a translated field resolve fallbacks like reading
+        the field does, see ``annotate_translations``.
+        """
+        return self._clone(_fallbacks=enabled)
+
+    def order_by(self, *field_names):
+        lang = get_language()
+        collation = settings.COLLATIONS.get(lang)
+        translated_fields = get_translated_fields(self.model)
+        clone = self._clone()
+        ordering = []
+        select = SortedDict()
+        select_params = []
+        raw = False
+        for field_name in field_names:
+            if not isinstance(field_name, basestring) or field_name == '?':
+                ordering.append(field_name)
+                continue
+            prefix = field_name.startswith('-') and '-' or ''
+            name = field_name.lstrip('-')
+            if name in translated_fields:
+                translation = name, lang
+            else:
+                translation = split_localized_name(self.model, name)
+            if translation is not None:
+                storage = get_translation_storage(self.model, *translation)
+            if name in translated_fields and clone._fallbacks:
+                # Order by an extra selected expression as it can't be
+                # expressed as a column
+                sql, params = clone._fallback_sql(name, lang)
+                if collation:
+                    sql = '%s COLLATE %s' % (sql, collation)
+                alias = '%s_translated' % name
+                select[alias] = sql
+                select_params.extend(params)
+                ordering.append(prefix + alias)
+                raw = True
+            elif translation is not None and not storage.concrete:
+                # Translations which aren't stored in columns are selected
+                # by the expression of their storage
+                sql = clone._translation_sql(*translation)
+                if collation:
+                    sql = '%s COLLATE %s' % (sql, collation)
+                alias = '%s_translated' % name
+                select[alias] = sql
+                ordering.append(prefix + alias)
+                raw = True
+            elif name in translated_fields and collation:
+                # Extra orderings containing a dot are passed on verbatim
+                ordering.append('%s%s COLLATE %s' % (
+                    prefix, clone._column_sql(
+                        get_localized_fieldname(self.model, name, lang)),
+                    collation))
+                raw = True
+            else:
+                ordering.append(
+                    prefix + rewrite_lookup_key(self.model, name, lang))
+        if not raw:
+            return super(TranslationQuerySet, clone).order_by(*ordering)
+        # Raw SQL can only be passed as extra ordering, which replaces the
+        # regular ordering
+        clone = super(TranslationQuerySet, clone).order_by()
+        clone.query.add_extra(select, select_params, None, None, None,
+                              ordering)
+        return clone
+
+    def _translate_values_fields(self, fields):
+        """
+        Returns a clone which selects the translated fields in ``fields``
+        (defaults to all fields) from the translation field of the current
+        language under their own name, and the fields to pass on to
+        ``values`` or ``values_list``.
+        """
+        translated_fields = get_translated_fields(self.model)
+        query = self.query
+        if not fields:
+            fields = (query.extra_select.keys() +
+                      [f.attname for f in self.model._meta.fields] +
+                      query.aggregate_select.keys())
+        clone = self._clone()
+        select = SortedDict()
+        select_params = []
+        for field_name in fields:
+            if field_name not in translated_fields:
+                translation = split_localized_name(self.model, field_name)
+                if translation is not None and not get_translation_storage(
+                        self.model, *translation).concrete:
+                    # Not a column, select the expression of its storage
+                    select[field_name] = clone._translation_sql(*translation)
+                continue
+            if clone._fallbacks:
+                sql, params = clone._fallback_sql(field_name)
+            else:
+                sql, params = clone._translation_sql(
+                    field_name, get_language()), []
+            select[field_name] = sql
+            select_params.extend(params)
+        if select:
+            clone.query.add_extra(select, select_params, None, None, None,
+                                  None)
+        return clone, fields
+
+    def _keep_ordering_columns(self):
+        """
+        ``values`` only selects the requested extra columns, keep the ones
+        needed for ordering (see ``order_by``) selected as well.
+        """
+        ordering = [o.lstrip('-') for o in self.query.extra_order_by
+                    if isinstance(o, basestring)]
+        hidden = [name for name in self.query.extra
+                  if name in ordering and name not in self.extra_names]
+        if hidden:
+            self.query.set_extra_mask(self.extra_names + hidden)
+
+    def values(self, *fields):
+        clone, fields = self._translate_values_fields(fields)
+        clone = super(TranslationQuerySet, clone).values(*fields)
+        clone._keep_ordering_columns()
+        return clone
+
+    def values_list(self, *fields, **kwargs):
+        clone, fields = self._translate_values_fields(fields)
+        clone = super(TranslationQuerySet, clone).values_list(
+            *fields, **kwargs)
+        clone._keep_ordering_columns()
+        return clone
+
+    def iterator(self):
+        if isinstance(self, ValuesQuerySet):
+            if (isinstance(self, ValuesListQuerySet) and self.flat and
+                    len(self._fields) == 1 and self.query.extra_select):
+                rows = self._flat_values()
+            else:
+                rows = super(TranslationQuerySet, self).iterator()
+            if (not isinstance(self, ValuesListQuerySet) and
+                    self.extra_names is not None):
+                hidden = [name for name in self.query.extra_select
+                          if name not in self.extra_names]
+                if hidden:
+                    rows = self._strip_values(rows, hidden)
+            compressed = self._compressed_fields()
+            if compressed:
+                rows = self._decompress_values(rows, compressed)
+            return rows
+        if not isinstance(self, (ValuesQuerySet, DateQuerySet)):
+            tables = get_translation_tables(self.model)
+            if tables:
+                return self._prefetch_translations(
+                    super(TranslationQuerySet, self).iterator(), tables)
+        return super(TranslationQuerySet, self).iterator()
+
+    def _prefetch_translations(self, objs, tables):
+        """
+        Loads the translations in the current language kept in translation
+        tables (see ``modeltranslation.storage.TableStorage``) for every chunk
+        of ``objs`` in one query per table.
+        """
+        lang = get_language()
+        chunk = []
+        for obj in objs:
+            chunk.append(obj)
+            if len(chunk) == ITER_CHUNK_SIZE:
+                for table in tables:
+                    table.prefetch(chunk, lang)
+                for obj in chunk:
+                    yield obj
+                chunk = []
+        for table in tables:
+            table.prefetch(chunk, lang)
+        for obj in chunk:
+            yield obj
+
+    def _strip_values(self, rows, names):
+        for row in rows:
+            for name in names:
+                del row[name]
+            yield row
+
+    def _flat_values(self):
+        """
+        Yields the values of a flat ``values_list`` queryset. Django takes
+        the first column of each row, which is an extra column kept for
+        ordering (see ``_keep_ordering_columns``) if there is one.
+        """
+        names = (self.query.extra_select.keys() + self.field_names +
+                 self.query.aggregate_select.keys())
+        index = names.index(self._fields[0])
+        for row in self.query.get_compiler(self.db).results_iter():
+            yield row[index]
+
+    def _values_names(self):
+        """
+        Returns the names of the values in the rows of a ``values_list``
+        queryset, in order.
+        """
+        aggregate_names = self.query.aggregate_select.keys()
+        if self._fields:
+            return list(self._fields) + [name for name in aggregate_names
+                                         if name not in self._fields]
+        return (self.query.extra_select.keys() + self.field_names +
+                aggregate_names)
+
+    def _compressed_fields(self):
+        """
+        Maps the names of the selected values which are compressed
+        translations (see ``CompressedTranslationField``) to their field.
+        """
+        translated_fields = get_translated_fields(self.model)
+        names = (self.query.extra_select.keys() + self.field_names +
+                 self.query.aggregate_select.keys())
+        compressed = {}
+        for name in names:
+            if name in translated_fields:
+                translation = name, get_language()
+            else:
+                translation = split_localized_name(self.model, name)
+                if translation is None:
+                    continue
+            field = get_compressed_field(self.model, *translation)
+            if field is not None:
+                compressed[name] = field
+        return compressed
+
+    def _decompress_values(self, rows, compressed):
+        if not isinstance(self, ValuesListQuerySet):
+            for row in rows:
+                for name, field in compressed.items():
+                    if name in row:
+                        row[name] = field.to_python(row[name])
+                yield row
+            return
+        names = self._values_names()
+        if self.flat and len(self._fields) == 1:
+            field = compressed[names[0]]
+            for value in rows:
+                yield field.to_python(value)
+            return
+        positions = [(i, compressed[name]) for i, name in enumerate(names)
+                     if name in compressed]
+        for row in rows:
+            row = list(row)
+            for i, field in positions:
+                row[i] = field.to_python(row[i])
+            yield tuple(row)
+
+    def update(self, **kwargs):
+        """
+        Updates translated fields consistently: a translated field updates
+        the translation field of the current language, and the translation
+        field of the default language updates the original field as well.
+        """
+        lang = get_language()
+        values = {}
+        for field_name in get_translated_fields(self.model):
+            if field_name in kwargs:
+                loc_field_name = get_localized_fieldname(
+                    self.model, field_name, lang)
+                values[loc_field_name] = kwargs[field_name]
+                if lang != settings.DEFAULT_LANGUAGE:
+                    # The original field keeps the default language
+                    del kwargs[field_name]
+            else:
+                loc_field_name = get_localized_fieldname(
+                    self.model, field_name, settings.DEFAULT_LANGUAGE)
+                if loc_field_name in kwargs:
+                    values[field_name] = kwargs[loc_field_name]
+        for key, value in values.items():
+            # Explicitly passed values take precedence
+            kwargs.setdefault(key, value)
+        status_languages = self._status_languages(kwargs)
+        if status_languages:
+            # The rows might not match the filters anymore after the update
+            pks = list(self.values_list('pk', flat=True))
+        rows = None
+        for key in kwargs.keys():
+            translation = split_localized_name(self.model, key)
+            if translation is None:
+                continue
+            storage = get_translation_storage(self.model, *translation)
+            if not storage.concrete:
+                # Translations which aren't stored in columns are updated by
+                # their storage
+                rows = storage.update(self, translation[1], kwargs.pop(key))
+        if kwargs or rows is None:
+            rows = super(TranslationQuerySet, self).update(**kwargs)
+        if status_languages:
+            TranslationQuerySet(self.model, using=self.db).filter(
+                pk__in=pks).update_translation_status(status_languages)
+        return rows
+    update.alters_data = True
+
+    def _status_languages(self, values):
+        """
+        Returns the languages of the translations in ``values`` whose
+        ``TranslationStatusField`` needs to be updated.
+        """
+        languages = []
+        for key in values:
+            translation = split_localized_name(self.model, key)
+            if translation is None or translation[1] in languages:
+                continue
+            try:
+                self.model._meta.get_field(
+                    build_localized_fieldname('translated', translation[1]))
+            except FieldDoesNotExist:
+                continue
+            languages.append(translation[1])
+        return languages
+
+    def translated_into(self, lang):
+        """
+        Returns the objects with a translation of any translated field in
+        ``lang``. Requires the ``translation_status`` translation option.
+        """
+        return self.filter(**{self._status_field_name(lang): True})
+
+    def missing_translation(self, lang):
+        """
+        Returns the objects without any translation in ``lang``. Requires the
+        ``translation_status`` translation option.
+        """
+        return self.filter(**{self._status_field_name(lang): False})
+
+    def _status_field_name(self, lang):
+        name = build_localized_fieldname('translated', lang)
+        try:
+            self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ValueError(
+                "%s doesn't track the translation status in '%s', see the "
+                "translation_status option." % (self.model.__name__, lang))
+        return name
+
+    def update_translation_status(self, languages=None):
+        """
+        Recomputes the ``TranslationStatusField`` of ``languages`` (defaults
+        to all languages) of the objects.
+        """
+        translated_fields = get_translated_fields(self.model)
+        for lang in languages or settings.AVAILABLE_LANGUAGES:
+            name = build_localized_fieldname('translated', lang)
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            translated = reduce(operator.or_, [
+                Q(**{'%s__isnull' % get_localized_fieldname(
+                    self.model, field_name, lang): False})
+                for field_name in field.field_names
+                if field_name in translated_fields])
+            QuerySet.update(self.filter(translated), **{name: True})
+            QuerySet.update(self.exclude(translated), **{name: False})
+    update_translation_status.alters_data = True
+
+    def bulk_create(self, objs, batch_size=None):
+        """
+        Inserts the objects with the default language activated, so the
+        original fields store the translation field of the default language
+        (if set), like saving an object in the default language does. Empty
+        translation fields of the default language are filled from the
+        original fields by ``TranslationField.pre_save``.
+        """
+        # Older Django versions don't accept a batch size
+        kwargs = {}
+        if batch_size is not None:
+            kwargs['batch_size'] = batch_size
+        with override(settings.DEFAULT_LANGUAGE):
+            return super(TranslationQuerySet, self).bulk_create(
+                objs, **kwargs)
+
+    def complex_filter(self, filter_obj):
+        if isinstance(filter_obj, Q):
+            filter_obj = rewrite_q(self.model, filter_obj,
+                                   translated=self._rewrite_lookups)
+        return super(TranslationQuerySet, self).complex_filter(filter_obj)
+
+    def get_or_create(self, **kwargs):
+        if self._rewrite_lookups:
+            # The created object has to match the rewritten lookups, so the
+            # translation fields of the current language are set as well
+            lang = get_language()
+            translated_fields = get_translated_fields(self.model)
+            defaults = dict(kwargs.pop('defaults', {}))
+            for key, value in kwargs.items():
+                if key in translated_fields:
+                    defaults.setdefault(
+                        get_localized_fieldname(self.model, key, lang), value)
+            kwargs['defaults'] = defaults
+        return super(TranslationQuerySet, self).get_or_create(**kwargs)
+
+    def defer_inactive_languages(self):
+        """
+        Defers the translation fields of all languages except the current
+        and the default language. Deferred fields are loaded on access.
+        """
+        active = (get_language(), settings.DEFAULT_LANGUAGE)
+        deferred = [get_localized_fieldname(self.model, field_name, lang)
+                    for field_name in get_translated_fields(self.model)
+                    for lang in settings.AVAILABLE_LANGUAGES
+                    if lang not in active and get_translation_storage(
+                        self.model, field_name, lang).concrete]
+        deferred.extend(self._inactive_storage_fields(active))
+        if not deferred:
+            return self._clone()
+        return self.defer(*deferred)
+
+    def defer_cold_languages(self):
+        """
+        Defers the columns holding the translations in the cold languages
+        (see the ``hot_languages`` translation option), unless one of them
+        is the current language.
+        """
+        deferred = self._inactive_storage_fields(
+            (get_language(), settings.DEFAULT_LANGUAGE))
+        if not deferred:
+            return self._clone()
+        return self.defer(*deferred)
+
+    def _inactive_storage_fields(self, active):
+        """
+        Returns the names of the fields added by storages which aren't
+        translation fields (e.g. JSON columns) and only hold translations in
+        languages other than ``active``.
+        """
+        names = []
+        for field_name in get_translated_fields(self.model):
+            for lang in settings.AVAILABLE_LANGUAGES:
+                storage = get_translation_storage(self.model, field_name,
+                                                  lang)
+                if (storage.concrete or
+                        [l for l in storage.languages if l in active]):
+                    continue
+                for field in storage.get_fields():
+                    if (field.model is self.model and
+                            field.name not in names):
+                        names.append(field.name)
+        return names
+
+    def _model_alias(self, model):
+        """
+        Returns the alias of the table of ``model``, which is either the
+        model of the queryset or one of its parents (joined if necessary).
+        """
+        query = self.query
+        alias = query.get_initial_alias()
+        if model is not None and model is not self.model:
+            link = self.model._meta.get_ancestor_link(model)
+            alias = query.join((alias, model._meta.db_table, link.column,
+                                model._meta.pk.column))
+        return alias
+
+    def _column_sql(self, field_name):
+        """
+        Returns the qualified column of ``field_name`` for use in raw SQL,
+        joining the table of the parent model declaring it if necessary.
+        """
+        field, model, direct, m2m = self.model._meta.get_field_by_name(
+            field_name)
+        qn = connections[self.db].ops.quote_name
+        return '%s.%s' % (qn(self._model_alias(model)), qn(field.column))
+
+    def _translation_sql(self, field_name, lang):
+        """
+        Returns the SQL of the translation of ``field_name`` in ``lang``,
+        which is the translation field or the expression of its storage.
+        """
+        storage = get_translation_storage(self.model, field_name, lang)
+        if storage.concrete:
+            return self._column_sql(get_localized_fieldname(
+                self.model, field_name, lang))
+        connection = connections[self.db]
+        return storage.value_sql(connection.ops.quote_name, connection,
+                                 self._model_alias(storage.model), lang)
+
+    def _fallback_sql(self, field_name, lang=None):
+        """
+        Returns the SQL and params of an expression resolving ``field_name``
+        like the ``TranslationFieldDescriptor`` does: the value of ``lang``
+        (defaults to the current language), then the value of the default
+        language if the field is deduplicated, then the fallback value or the
+        original field.
+        """
+        if lang is None:
+            lang = get_language()
+        descriptor = get_translation_descriptor(self.model, field_name)
+        langs = [lang]
+        if (getattr(descriptor, 'dedupe', False) and
+                lang != settings.DEFAULT_LANGUAGE):
+            langs.append(settings.DEFAULT_LANGUAGE)
+        parts = []
+        field = self.model._meta.get_field(field_name)
+        for l in langs:
+            column = self._translation_sql(field_name, l)
+            if isinstance(field, (CharField, TextField)):
+                column = "NULLIF(%s, '')" % column
+            parts.append(column)
+        params = []
+        fallback_value = getattr(descriptor, 'fallback_value', None)
+        if fallback_value is None:
+            parts.append(self._column_sql(field_name))
+        else:
+            parts.append('%s')
+            params.append(force_unicode(fallback_value))
+        return 'COALESCE(%s)' % ', '.join(parts), params
+
+    def annotate_translations(self, *field_names):
+        """
+        Adds the value of each translated field in ``field_names`` (defaults
+        to all translated fields) for the current language as
+        ``<field_name>_translated`` to the selected columns. Fallbacks are
+        resolved by the database, so this works with ``values`` too.
+        """
+        translated_fields = get_translated_fields(self.model)
+        if not field_names:
+            field_names = translated_fields
+        clone = self._clone()
+        select = SortedDict()
+        select_params = []
+        for field_name in field_names:
+            if field_name not in translated_fields:
+                raise ValueError("'%s' is not a translated field of %s." % (
+                    field_name, self.model.__name__))
+            sql, params = clone._fallback_sql(field_name)
+            select['%s_translated' % field_name] = sql
+            select_params.extend(params)
+        clone.query.add_extra(select, select_params, None, None, None, None)
+        return clone
+
+
+class TranslationBaseQuerySet(QuerySet):
+    """
+    The queryset of the base manager of models registered for translation,
+    which Django uses to save instances. Unchanged translation fields are
+    left out of the UPDATE statement, see ``TranslationField.pre_save``.
+    """
+    def _update(self, values):
+        unchanged_originals = set(
+            id(field.translated_field) for field, model, value in values
+            if isinstance(value, Unchanged) and value.original)
+        values = [(field, model, value) for field, model, value in values
+                  if not isinstance(value, Unchanged) and
+                  id(field) not in unchanged_originals]
+        if not values:
+            # Nothing to update, but report whether the row exists for
+            # ``save(force_update=True)``
+            return self.count()
+        return super(TranslationBaseQuerySet, self)._update(values)
+    _update.alters_data = True
+
+
+class TranslationBaseManager(Manager):
+    """
+    A manager returning ``TranslationBaseQuerySet`` instances.
+    """
+    def get_query_set(self):
+        qs = super(TranslationBaseManager, self).get_query_set()
+        if not isinstance(qs, TranslationBaseQuerySet):
+            qs.__class__ = _mix_class(TranslationBaseQuerySet, qs.__class__)
+        return qs
+
+
+class TranslationManager(Manager):
+    """
+    A manager returning ``TranslationQuerySet`` instances.
+
+    If the translation options of the model set ``defer_inactive_languages``,
+    the translation fields of inactive languages are deferred automatically.
+    The columns holding the cold languages of models declaring
+    ``hot_languages`` are deferred while a hot language is active.
+    """
+    def get_query_set(self):
+        qs = super(TranslationManager, self).get_query_set()
+        if not isinstance(qs, TranslationQuerySet):
+            qs.__class__ = _mix_class(TranslationQuerySet, qs.__class__)
+        opts = get_translation_options(self.model)
+        if opts is not None and getattr(
+                opts, 'defer_inactive_languages', False):
+            qs = qs.defer_inactive_languages()
+        elif (opts is not None and
+              getattr(opts, 'hot_languages', None) is not None):
+            qs = qs.defer_cold_languages()
+        return qs
+
+    def defer_inactive_languages(self):
+        return self.get_query_set().defer_inactive_languages()
+
+    def defer_cold_languages(self):
+        return self.get_query_set().defer_cold_languages()
+
+    def annotate_translations(self, *field_names):
+        return self.get_query_set().annotate_translations(*field_names)
+
+    def with_fallbacks(self, enabled=True):
+        return self.get_query_set().with_fallbacks(enabled)
+
+    def translated_into(self, lang):
+        return self.get_query_set().translated_into(lang)
+
+    def missing_translation(self, lang):
+        return self.get_query_set().missing_translation(lang)
+
+
+class CurrentLanguageManager(TranslationManager):
+    """
+    A manager whose querysets rewrite lookups on translated fields to the
+    translation field of the current language, added to models whose
+    translation options set ``translated_manager`` under that name. The
+    other managers of the model keep querying the original fields.
+    """
+    def get_query_set(self):
+        qs = super(CurrentLanguageManager, self).get_query_set()
+        qs._rewrite_lookups = True
+        return qs
+
+
+def patch_manager_class(manager):
+    """
+    Makes the class of ``manager`` derive from ``TranslationManager``.
+    """
+    manager.__class__ = _mix_class(TranslationManager, manager.__class__)
+
+
+def patch_managers(model):
+    """
+    Patches the managers declared on ``model``. The base manager Django uses
+    internally (e.g. for related objects and saving) only leaves unchanged
+    translation fields out when saving.
+    """
+    default_manager = getattr(model, '_default_manager', None)
+    if default_manager is None:
+        # Abstract models have no managers
+        return
+    if getattr(model, '_base_manager', None) is default_manager:
+        model._base_manager = copy(default_manager)
+    base_manager = model._base_manager
+    base_manager.__class__ = _mix_class(TranslationBaseManager,
+                                        base_manager.__class__)
+    for counter, name, manager in model._meta.concrete_managers:
+        patch_manager_class(manager)
+    patch_manager_class(default_manager)
@@ -22,6 +22,15 @@ try:
 except IndexError:
     pass
 
+# Collations used when ordering by a translated field, mapping a language code
+# to the name of a collation of the database backend, e.g. {'de': 'de_DE'}
+COLLATIONS = getattr(settings, 'MODELTRANSLATION_COLLATIONS', {})
+
+# Number of interned translation strings (see the ``interned`` storage) kept
+# in memory per process
+INTERNED_CACHE_SIZE = getattr(
+    settings, 'MODELTRANSLATION_INTERNED_CACHE_SIZE', 10000)
+
 # Don't change this setting unless you really know what you are doing
 ENABLE_REGISTRATIONS = getattr(
     settings, 'MODELTRANSLATION_ENABLE_REGISTRATIONS', settings.USE_I18N)
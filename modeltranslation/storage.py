@@ -0,0 +1,1011 @@
+# -*- coding: utf-8 -*-
+"""
+Storage of translations.
+
+By default the translations of a field are stored in columns of their own, one
+``TranslationField`` per language. The ``storage`` attribute of the
+``TranslationOptions`` selects another storage for all translated fields of a
+model or, given as a dict, per field::
+
+    class NewsTranslationOptions(TranslationOptions):
+        fields = ('title', 'text',)
+        storage = {'text': 'json'}
+
+Translations which aren't stored in columns of their own are still accessed
+as ``text_de``, ``text_en`` and so on, which are plain attributes then.
+Lookups, ordering and ``values`` on them are compiled to SQL expressions by
+the storage.
+"""
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, models
+from django.db.models import signals
+from django.db.models.fields import Field, TextField, NOT_PROVIDED
+from django.db.models.query import QuerySet
+from django.db.models.query_utils import Q
+from django.db.models.sql.where import Constraint, AND
+from django.utils import simplejson
+
+from modeltranslation import settings as mt_settings
+from modeltranslation.fields import (create_translation_field,
+                                    get_localized_fieldname)
+
+
+def is_deduplicated(translation_opts, field_name):
+    """
+    Returns whether translations of ``field_name`` which equal the
+    translation in the default language are stored as ``NULL``, according to
+    the ``dedupe`` option (``True`` or a tuple of field names) of
+    ``translation_opts``.
+    """
+    dedupe = getattr(translation_opts, 'dedupe', False)
+    return dedupe is True or field_name in (dedupe or ())
+
+
+def check_localized_name(model, name):
+    """
+    Raises a ``ValueError`` if ``model`` already has an attribute ``name``.
+    """
+    if hasattr(model, name):
+        raise ValueError(
+            "Error adding translation field. Model '%s' already "
+            "contains a field named '%s'." % (model.__name__, name))
+
+
+class ExpressionConstraint(Constraint):
+    """
+    A constraint on an SQL expression of a column instead of the column
+    itself. ``template`` is the expression with ``%s`` in place of the
+    qualified column, the value is prepared by ``field``.
+    """
+    def __init__(self, alias, col, field, template):
+        super(ExpressionConstraint, self).__init__(alias, col, field)
+        self.template = template
+
+    def process(self, lookup_type, value, connection):
+        params = self.field.get_db_prep_lookup(
+            lookup_type, value, connection=connection, prepared=True)
+        return self, params
+
+    def as_sql(self, qn, connection):
+        return self.template % ('%s.%s' % (qn(self.alias), qn(self.col)))
+
+
+class ExpressionValue(object):
+    """
+    A value for ``QuerySet.update`` which is an SQL expression of the updated
+    column. ``template`` is the expression with ``%(column)s`` in place of
+    the column.
+    """
+    def __init__(self, column, template, params):
+        self.column = column
+        self.template = template
+        self.params = params
+
+    def prepare_database_save(self, field):
+        return self
+
+    def as_sql(self, qn, connection):
+        return self.template % {'column': qn(self.column)}, self.params
+
+
+class TranslationStorage(object):
+    """
+    Stores the translations of the field ``field_name`` of ``model`` in
+    ``languages``.
+
+    Subclasses not storing the translations in columns of their own provide
+    the localized attributes by implementing ``get_value`` and
+    ``set_value``, and translate queries with ``value_sql``, ``lookup`` and
+    ``update``.
+    """
+    # Whether the translations are stored in ``TranslationField`` columns
+    concrete = False
+
+    def __init__(self, model, field_name, languages):
+        self.model = model
+        self.field_name = field_name
+        self.field = model._meta.get_field(field_name)
+        self.languages = list(languages)
+
+    def contribute_to_class(self, translation_opts):
+        """
+        Adds the localized attributes (and whatever else is needed to store
+        the translations) to the model. Returns the names of the localized
+        attributes.
+        """
+        localized_names = []
+        for lang in self.languages:
+            name = get_localized_fieldname(self.model, self.field_name, lang)
+            check_localized_name(self.model, name)
+            setattr(self.model, name, self.localized_property(lang))
+            localized_names.append(name)
+        return localized_names
+
+    def localized_property(self, lang):
+        # A property, as Model.__init__ only accepts keyword arguments for
+        # fields and properties
+        def fget(instance):
+            return self.get_value(instance, lang)
+
+        def fset(instance, value):
+            self.set_value(instance, lang, value)
+        return property(fget, fset)
+
+    def get_fields(self):
+        """
+        Returns the fields the storage added to the model.
+        """
+        return []
+
+    def get_value(self, instance, lang):
+        raise NotImplementedError
+
+    def set_value(self, instance, lang, value):
+        raise NotImplementedError
+
+    def value_sql(self, qn, connection, alias, lang):
+        """
+        Returns an SQL expression of the translation in ``lang`` of the row
+        of the model's table ``alias``.
+        """
+        raise NotImplementedError
+
+    def lookup(self, lang, lookup_type, value):
+        """
+        Returns a ``(lookup, value)`` tuple which filters the model by the
+        translation in ``lang``.
+        """
+        raise NotImplementedError
+
+    def update(self, queryset, lang, value):
+        """
+        Sets the translation in ``lang`` of all objects in ``queryset`` to
+        ``value``. Returns the number of rows matched.
+        """
+        raise NotImplementedError
+
+
+class ColumnStorage(TranslationStorage):
+    """
+    Stores every translation in a column of its own, realized by a
+    ``TranslationField``. This is the default.
+    """
+    concrete = True
+
+    def contribute_to_class(self, translation_opts):
+        self.translation_fields = []
+        localized_names = []
+        compress = self.field_name in getattr(translation_opts, 'compress',
+                                              ())
+        dedupe = is_deduplicated(translation_opts, self.field_name)
+        for lang in self.languages:
+            # Create a dynamic translation field
+            translation_field = create_translation_field(
+                model=self.model, field_name=self.field_name, lang=lang,
+                compress=compress)
+            translation_field.dedupe = (
+                dedupe and lang != mt_settings.DEFAULT_LANGUAGE)
+            if getattr(translation_opts, 'indexes', None) is not None:
+                # Don't copy the index of the original field, the indexes of
+                # the translation fields are declared explicitly.
+                translation_field.db_index = False
+            # Construct the name for the localized field
+            localized_field_name = get_localized_fieldname(
+                self.model, self.field_name, lang)
+            # Check if the model already has a field by that name
+            check_localized_name(self.model, localized_field_name)
+            # This approach implements the translation fields as full valid
+            # django model fields and therefore adds them via add_to_class
+            self.model.add_to_class(localized_field_name, translation_field)
+            self.translation_fields.append(translation_field)
+            localized_names.append(localized_field_name)
+        return localized_names
+
+    def get_fields(self):
+        return self.translation_fields
+
+
+class TranslationJSONField(TextField):
+    """
+    A text column storing the translations of a field as JSON object mapping
+    language codes to values. Used by ``JSONStorage``.
+    """
+    def __init__(self, storage, *args, **kwargs):
+        self.storage = storage
+        kwargs.update(null=True, blank=True, editable=False)
+        super(TranslationJSONField, self).__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        values = self.storage.get_values(model_instance)
+        original_name = self.storage.field.attname
+        default = mt_settings.DEFAULT_LANGUAGE
+        if default in self.storage.languages:
+            if not add:
+                # Rule is: 3. Assigning a value to a translation field of the
+                # default language also updates the original field
+                model_instance.__dict__[original_name] = values.get(default)
+            elif values.get(default) in (None, ''):
+                # Like TranslationField.pre_save, fill the empty translation
+                # of the default language from the original field on insert
+                original = model_instance.__dict__.get(original_name)
+                if original not in (None, ''):
+                    values = dict(values)
+                    values[default] = original
+        return values
+
+    def get_prep_value(self, value):
+        if isinstance(value, dict):
+            if not value:
+                return None
+            return simplejson.dumps(value, sort_keys=True)
+        return value
+
+    def to_python(self, value):
+        if isinstance(value, basestring):
+            return value and simplejson.loads(value) or {}
+        return value
+
+    def value_to_string(self, obj):
+        return self.get_prep_value(self.storage.get_values(obj))
+
+    def south_field_triple(self):
+        """
+        Returns a suitable description of this field for South.
+        """
+        from south.modelsinspector import introspector
+        args, kwargs = introspector(self)
+        return ('django.db.models.fields.TextField', args, kwargs)
+
+
+class JSONStorage(TranslationStorage):
+    """
+    Stores all translations of a field in one column as JSON object, so
+    adding a language doesn't change the table. Languages without a
+    translation cost no space.
+
+    Querying the translations requires the JSON functions of the database
+    (JSON1 on SQLite, MySQL 5.7 or PostgreSQL 9.4).
+    """
+    extract_templates = {
+        'sqlite': "json_extract(%%s, '$.\"%s\"')",
+        'mysql': "JSON_UNQUOTE(JSON_EXTRACT(%%s, '$.\"%s\"'))",
+        'postgresql': "(%%s::json ->> '%s')",
+    }
+    set_templates = {
+        'sqlite': "json_set(COALESCE(%%(column)s, '{}'), '$.\"%s\"', %%%%s)",
+        'mysql': "JSON_SET(COALESCE(%%(column)s, '{}'), '$.\"%s\"', %%%%s)",
+        'postgresql': ("(COALESCE(%%(column)s, '{}')::jsonb || "
+                       "jsonb_build_object('%s', %%%%s::text))::text"),
+    }
+    remove_templates = {
+        'sqlite': "json_remove(%%(column)s, '$.\"%s\"')",
+        'mysql': "JSON_REMOVE(%%(column)s, '$.\"%s\"')",
+        'postgresql': "(%%(column)s::jsonb - '%s')::text",
+    }
+
+    def contribute_to_class(self, translation_opts):
+        name = '%s_translations' % self.field_name
+        check_localized_name(self.model, name)
+        self.json_field = TranslationJSONField(self)
+        self.model.add_to_class(name, self.json_field)
+        return super(JSONStorage, self).contribute_to_class(translation_opts)
+
+    def get_fields(self):
+        return [self.json_field]
+
+    def get_values(self, instance):
+        """
+        Returns the dict of translations of ``instance``, which is decoded
+        from JSON on first access.
+        """
+        attname = self.json_field.attname
+        try:
+            values = instance.__dict__[attname]
+        except KeyError:
+            # The column is deferred, let the model load it
+            values = getattr(instance, attname)
+        if not isinstance(values, dict):
+            values = instance.__dict__[attname] = \
+                self.json_field.to_python(values) or {}
+        return values
+
+    def get_value(self, instance, lang):
+        return self.get_values(instance).get(lang)
+
+    def set_value(self, instance, lang, value):
+        values = self.get_values(instance)
+        if value in (None, ''):
+            values.pop(lang, None)
+        else:
+            values[lang] = value
+
+    def get_template(self, templates, connection, lang):
+        try:
+            template = templates[connection.vendor]
+        except KeyError:
+            raise ImproperlyConfigured(
+                "JSON storage of translations is not supported by the "
+                "'%s' database backend." % connection.vendor)
+        return template % lang
+
+    def value_sql(self, qn, connection, alias, lang):
+        template = self.get_template(self.extract_templates, connection, lang)
+        return template % ('%s.%s' % (qn(alias), qn(self.json_field.column)))
+
+    def lookup(self, lang, lookup_type, value):
+        if lookup_type == 'exact' and value is None:
+            lookup_type, value = 'isnull', True
+        queryset = self.model._base_manager.all()
+        query = queryset.query
+        template = self.get_template(
+            self.extract_templates, connections[queryset.db], lang)
+        query.where.add((ExpressionConstraint(
+            query.get_initial_alias(), self.json_field.column, self.field,
+            template), lookup_type, value), AND)
+        return 'pk__in', queryset.values('pk')
+
+    def update(self, queryset, lang, value):
+        connection = connections[queryset.db]
+        if value in (None, ''):
+            template = self.get_template(
+                self.remove_templates, connection, lang)
+            params = []
+        else:
+            template = self.get_template(self.set_templates, connection, lang)
+            params = [self.field.get_db_prep_save(value, connection)]
+        return QuerySet.update(queryset, **{self.json_field.name:
+            ExpressionValue(self.json_field.column, template, params)})
+
+
+def quote_literal(value):
+    """
+    Returns ``value`` as SQL string literal, used for language codes and field
+    names which are known when building the SQL.
+    """
+    return "'%s'" % value.replace("'", "''")
+
+
+class TranslationTable(object):
+    """
+    The table ``<db_table>_translation`` of a model storing the translations
+    of the fields with ``TableStorage`` as rows of ``(object_id, language,
+    field, value)``. The rows are accessed by the dynamically created model
+    ``translation_model``.
+
+    The translations of an instance are cached per language in its
+    ``_translation_rows``, changes are kept in ``_translation_changes`` until
+    the instance is saved.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.field_names = []
+        self.storages = {}
+        self.languages = set()
+        self.create_translation_models()
+        signals.pre_save.connect(self.pre_save, weak=False,
+                                 dispatch_uid=self.dispatch_uid('pre_save'))
+        signals.post_save.connect(self.post_save, weak=False,
+                                  dispatch_uid=self.dispatch_uid('post_save'))
+
+    def dispatch_uid(self, signal_name):
+        return 'modeltranslation_%s_%s_%s_%s' % (
+            self.__class__.__name__, self.model._meta.app_label,
+            self.model._meta.object_name, signal_name)
+
+    def create_model(self, name, attrs, **meta):
+        opts = self.model._meta
+        meta.setdefault('app_label', opts.app_label)
+        attrs.update({'__module__': self.model.__module__,
+                      'Meta': type('Meta', (object,), meta)})
+        model = type(name, (models.Model,), attrs)
+        # The reverse relation of the new foreign key cascades deletions
+        for cache in ('_related_objects_cache',
+                      '_related_objects_proxy_cache'):
+            try:
+                delattr(opts, cache)
+            except AttributeError:
+                pass
+        return model
+
+    def create_translation_models(self):
+        opts = self.model._meta
+        self.translation_model = self.create_model(
+            '%sTranslationRow' % opts.object_name, {
+                'object': models.ForeignKey(self.model, related_name='+'),
+                'language': models.CharField(max_length=15, db_index=True),
+                'field': models.CharField(max_length=255),
+                'value': models.TextField(),
+            }, db_table='%s_translation' % opts.db_table,
+            unique_together=(('object', 'language', 'field'),))
+
+    def add_field(self, storage):
+        self.field_names.append(storage.field_name)
+        self.storages[storage.field_name] = storage
+        self.languages.update(storage.languages)
+
+    def load(self, pks, lang):
+        """
+        Returns ``(pk, field_name, value)`` tuples of the translations in
+        ``lang`` of the objects ``pks``.
+        """
+        return self.translation_model._default_manager.filter(
+            object__in=pks, language=lang).values_list(
+                'object', 'field', 'value')
+
+    def save(self, pk, lang, values, created):
+        """
+        Writes the changed translations ``values`` in ``lang`` of the object
+        ``pk``.
+        """
+        manager = self.translation_model._default_manager
+        for field_name, value in values.items():
+            rows = manager.filter(object=pk, language=lang, field=field_name)
+            if value in (None, ''):
+                rows.delete()
+            elif created or not rows.update(value=value):
+                manager.create(object_id=pk, language=lang, field=field_name,
+                               value=value)
+
+    def update(self, pks, lang, field_name, value):
+        """
+        Sets the translation of ``field_name`` in ``lang`` of the objects
+        ``pks`` to ``value``.
+        """
+        self.rows(lang, field_name).filter(object__in=pks).delete()
+        if value not in (None, ''):
+            self.translation_model._default_manager.bulk_create([
+                self.translation_model(
+                    object_id=pk, language=lang, field=field_name,
+                    value=value) for pk in pks])
+
+    def rows(self, lang, field_name):
+        """
+        Returns a queryset of the rows with a translation of ``field_name`` in
+        ``lang``, the translation is the column named ``value_name``.
+        """
+        return self.translation_model._default_manager.filter(
+            language=lang, field=field_name)
+
+    def value_name(self, field_name):
+        return 'value'
+
+    def value_sql(self, qn, alias, lang, field_name):
+        return ('(SELECT %s FROM %s WHERE %s = %s.%s AND %s = %s AND '
+                '%s = %s)' % (
+                    qn('value'), qn(self.translation_model._meta.db_table),
+                    qn('object_id'), qn(alias),
+                    qn(self.model._meta.pk.column), qn('language'),
+                    quote_literal(lang), qn('field'),
+                    quote_literal(field_name)))
+
+    def get_rows(self, instance, lang):
+        """
+        Returns the dict of translations of ``instance`` in ``lang``, which
+        is loaded on first access unless it was prefetched.
+        """
+        rows = instance.__dict__.setdefault('_translation_rows', {})
+        try:
+            return rows[lang]
+        except KeyError:
+            rows[lang] = values = {}
+            if instance.pk is not None:
+                for pk, field_name, value in self.load([instance.pk], lang):
+                    values[field_name] = value
+            return values
+
+    def prefetch(self, instances, lang):
+        """
+        Loads the translations in ``lang`` of all ``instances`` in one query.
+        """
+        if lang not in self.languages:
+            return
+        by_pk = {}
+        for instance in instances:
+            rows = instance.__dict__.setdefault('_translation_rows', {})
+            if lang not in rows:
+                rows[lang] = {}
+                by_pk[instance.pk] = rows[lang]
+        if not by_pk:
+            return
+        for pk, field_name, value in self.load(by_pk.keys(), lang):
+            by_pk[pk][field_name] = value
+
+    def pre_save(self, sender, instance, raw=False, **kwargs):
+        if not isinstance(instance, self.model) or raw:
+            return
+        changes = instance.__dict__.get('_translation_changes', {})
+        for field_name in self.field_names:
+            key = (field_name, mt_settings.DEFAULT_LANGUAGE)
+            if key in changes and not instance._state.adding:
+                # Rule is: 3. Assigning a value to a translation field of the
+                # default language also updates the original field
+                instance.__dict__[field_name] = changes[key]
+
+    def post_save(self, sender, instance, created=False, raw=False,
+                  **kwargs):
+        if not isinstance(instance, self.model) or raw:
+            return
+        changes = instance.__dict__.pop('_translation_changes', {})
+        if created:
+            # Like TranslationField.pre_save, fill the empty translation of
+            # the default language from the original field on insert
+            for field_name in self.field_names:
+                key = (field_name, mt_settings.DEFAULT_LANGUAGE)
+                original = instance.__dict__.get(field_name)
+                if (not changes.get(key) and original not in (None, '') and
+                        key[1] in self.storages[field_name].languages):
+                    changes[key] = original
+                    self.get_rows(instance, key[1])[field_name] = original
+        by_lang = {}
+        for (field_name, lang), value in changes.items():
+            by_lang.setdefault(lang, {})[field_name] = value
+        for lang, values in by_lang.items():
+            self.save(instance.pk, lang, values, created)
+
+
+class TranslationPartitions(TranslationTable):
+    """
+    The tables ``<db_table>_<lang>`` of a model, one per language, storing
+    the translations of the fields with ``PartitionStorage`` in that language
+    as columns named like the fields. Their primary key is the primary key of
+    the object, the rows are accessed by the dynamically created models
+    ``translation_models``.
+
+    Only the table of one language is read to load or look up translations,
+    saving an object only writes to the tables of the changed languages.
+    """
+    def create_translation_models(self):
+        self.translation_models = {}
+        self.partition_fields = {}
+
+    def get_translation_model(self, lang):
+        try:
+            return self.translation_models[lang]
+        except KeyError:
+            opts = self.model._meta
+            suffix = lang.replace('-', '_')
+            model = self.translation_models[lang] = self.create_model(
+                '%sTranslation%s' % (opts.object_name,
+                                     suffix.title().replace('_', '')), {
+                    'object': models.OneToOneField(
+                        self.model, primary_key=True, related_name='+'),
+                }, db_table='%s_%s' % (opts.db_table, suffix))
+            self.partition_fields[lang] = []
+            return model
+
+    def add_field(self, storage):
+        super(TranslationPartitions, self).add_field(storage)
+        for lang in storage.languages:
+            model = self.get_translation_model(lang)
+            field = copy(storage.field)
+            field.null = field.blank = True
+            field.primary_key = field._unique = field.db_index = False
+            field.default = NOT_PROVIDED
+            field.creation_counter = Field.creation_counter
+            Field.creation_counter += 1
+            field.contribute_to_class(model, storage.field_name)
+            self.partition_fields[lang].append(storage.field_name)
+
+    def load(self, pks, lang):
+        if lang not in self.translation_models:
+            return
+        field_names = self.partition_fields[lang]
+        for row in self.translation_models[lang]._default_manager.filter(
+                object__in=pks).values_list('object', *field_names):
+            for field_name, value in zip(field_names, row[1:]):
+                if value is not None:
+                    yield row[0], field_name, value
+
+    def save(self, pk, lang, values, created):
+        manager = self.translation_models[lang]._default_manager
+        values = dict((field_name, value not in (None, '') and value or None)
+                      for field_name, value in values.items())
+        if ((created or not manager.filter(object=pk).update(**values)) and
+                [value for value in values.values() if value is not None]):
+            manager.create(object_id=pk, **values)
+
+    def update(self, pks, lang, field_name, value):
+        if value in (None, ''):
+            value = None
+        model = self.translation_models[lang]
+        rows = model._default_manager.filter(object__in=pks)
+        rows.update(**{field_name: value})
+        if value is not None:
+            existing = set(rows.values_list('object', flat=True))
+            model._default_manager.bulk_create([
+                model(object_id=pk, **{field_name: value})
+                for pk in pks if pk not in existing])
+
+    def rows(self, lang, field_name):
+        return self.translation_models[lang]._default_manager.filter(
+            **{'%s__isnull' % field_name: False})
+
+    def value_name(self, field_name):
+        return field_name
+
+    def value_sql(self, qn, alias, lang, field_name):
+        model = self.translation_models[lang]
+        return '(SELECT %s FROM %s WHERE %s = %s.%s)' % (
+            qn(model._meta.get_field(field_name).column),
+            qn(model._meta.db_table), qn(model._meta.pk.column), qn(alias),
+            qn(self.model._meta.pk.column))
+
+
+class LRUCache(object):
+    """
+    A mapping keeping the ``size`` most recently used items.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.data = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value = self.data.pop(key)
+            except KeyError:
+                return default
+            self.data[key] = value
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.data.pop(key, None)
+            self.data[key] = value
+            if len(self.data) > self.size:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+class StringTable(object):
+    """
+    The table of ``(language, text)`` strings shared by the fields with
+    ``InternedStorage``, accessed by the dynamically created model
+    ``string_model``. Strings are cached in an LRU cache of
+    ``MODELTRANSLATION_INTERNED_CACHE_SIZE`` entries by their id and by
+    their language and text, so frequent strings are only loaded once per
+    process.
+    """
+    max_length = 255
+
+    def __init__(self):
+        class Meta:
+            app_label = 'modeltranslation'
+            db_table = 'modeltranslation_string'
+            unique_together = (('language', 'text'),)
+        self.string_model = type('TranslationString', (models.Model,), {
+            '__module__': __name__,
+            'Meta': Meta,
+            'language': models.CharField(max_length=15),
+            'text': models.CharField(max_length=self.max_length),
+        })
+        self.cache = LRUCache(mt_settings.INTERNED_CACHE_SIZE)
+
+    def get_text(self, pk):
+        text = self.cache.get(pk)
+        if text is None:
+            self.load([pk])
+            text = self.cache.get(pk)
+        return text
+
+    def load(self, pks):
+        """
+        Loads the strings ``pks`` which aren't cached in one query.
+        """
+        pks = [pk for pk in pks if self.cache.get(pk) is None]
+        if not pks:
+            return
+        for pk, lang, text in self.string_model._default_manager.filter(
+                pk__in=pks).values_list('pk', 'language', 'text'):
+            self.cache.set(pk, text)
+            self.cache.set((lang, text), pk)
+
+    def intern(self, lang, text):
+        """
+        Returns the id of the string ``text`` in ``lang``, which is created
+        if it doesn't exist.
+        """
+        pk = self.cache.get((lang, text))
+        if pk is None:
+            string, created = (
+                self.string_model._default_manager.get_or_create(
+                    language=lang, text=text))
+            pk = string.pk
+            if not created:
+                # A string created now is only cached once it is loaded
+                # again, as the transaction creating it might be rolled back
+                self.cache.set(pk, text)
+                self.cache.set((lang, text), pk)
+        return pk
+
+
+def get_string_table():
+    global _string_table
+    if _string_table is None:
+        _string_table = StringTable()
+    return _string_table
+
+_string_table = None
+
+
+class InternedStrings(object):
+    """
+    Loads the interned strings of the fields with ``InternedStorage`` of a
+    model which aren't cached, for a chunk of objects of a queryset at once.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.attnames = {}
+
+    def add_field(self, storage):
+        for lang, field in storage.string_fields.items():
+            self.attnames.setdefault(lang, []).append(field.attname)
+
+    def prefetch(self, instances, lang):
+        attnames = self.attnames.get(lang)
+        if not attnames:
+            return
+        get_string_table().load(set(
+            instance.__dict__.get(attname) for instance in instances
+            for attname in attnames) - set([None]))
+
+
+class InternedStringField(models.ForeignKey):
+    """
+    The foreign key of a translation into the string table, added by
+    ``InternedStorage``. A translation assigned to the localized attribute is
+    interned when the object is saved.
+    """
+    def __init__(self, storage, language, *args, **kwargs):
+        self.storage = storage
+        self.language = language
+        kwargs.update(null=True, blank=True, editable=False,
+                      related_name='+')
+        super(InternedStringField, self).__init__(
+            get_string_table().string_model, *args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        name = get_localized_fieldname(
+            self.storage.model, self.storage.field_name, self.language)
+        original_name = self.storage.field.attname
+        values = model_instance.__dict__
+        if self.language == mt_settings.DEFAULT_LANGUAGE:
+            if not add:
+                # Rule is: 3. Assigning a value to a translation field of the
+                # default language also updates the original field
+                values[original_name] = self.storage.get_value(
+                    model_instance, self.language)
+            elif self.storage.get_value(
+                    model_instance, self.language) in (None, ''):
+                # Like TranslationField.pre_save, fill the empty translation
+                # of the default language from the original field on insert
+                original = values.get(original_name)
+                if original not in (None, ''):
+                    values[name] = original
+        if name in values:
+            # Assigned since the object was loaded
+            text = values[name]
+            if text in (None, ''):
+                values[self.attname] = None
+            else:
+                values[self.attname] = get_string_table().intern(
+                    self.language, text)
+        return values.get(self.attname)
+
+    def south_field_triple(self):
+        from south.modelsinspector import introspector
+        args, kwargs = introspector(self)
+        return ('django.db.models.fields.related.ForeignKey', args, kwargs)
+
+
+class InternedStorage(TranslationStorage):
+    """
+    Stores the translations of a ``CharField`` as foreign keys
+    ``<field_name>_<lang>_string`` into a table of strings shared by all
+    models (see ``StringTable``), so repeated values are stored once. Lookups
+    join the string table.
+    """
+    def contribute_to_class(self, translation_opts):
+        if self.field.max_length > StringTable.max_length:
+            raise ImproperlyConfigured(
+                "Interned translations are limited to %d characters, "
+                "%s.%s allows %d." % (
+                    StringTable.max_length, self.model.__name__,
+                    self.field_name, self.field.max_length))
+        self.string_fields = {}
+        for lang in self.languages:
+            name = '%s_string' % get_localized_fieldname(
+                self.model, self.field_name, lang)
+            check_localized_name(self.model, name)
+            field = InternedStringField(self, lang)
+            self.model.add_to_class(name, field)
+            self.string_fields[lang] = field
+        get_translation_table(self.model, InternedStrings).add_field(self)
+        return super(InternedStorage, self).contribute_to_class(
+            translation_opts)
+
+    def get_fields(self):
+        return [self.string_fields[lang] for lang in self.languages]
+
+    def get_value(self, instance, lang):
+        name = get_localized_fieldname(self.model, self.field_name, lang)
+        try:
+            return instance.__dict__[name]
+        except KeyError:
+            pk = getattr(instance, self.string_fields[lang].attname)
+            if pk is None:
+                return None
+            return get_string_table().get_text(pk)
+
+    def set_value(self, instance, lang, value):
+        instance.__dict__[get_localized_fieldname(
+            self.model, self.field_name, lang)] = value
+
+    def value_sql(self, qn, connection, alias, lang):
+        string_model = get_string_table().string_model
+        return '(SELECT %s FROM %s WHERE %s = %s.%s)' % (
+            qn('text'), qn(string_model._meta.db_table),
+            qn(string_model._meta.pk.column), qn(alias),
+            qn(self.string_fields[lang].column))
+
+    def lookup(self, lang, lookup_type, value):
+        name = self.string_fields[lang].name
+        if lookup_type == 'exact' and value is None:
+            lookup_type, value = 'isnull', True
+        if lookup_type == 'isnull':
+            return '%s__isnull' % name, value
+        return '%s__text__%s' % (name, lookup_type), value
+
+    def update(self, queryset, lang, value):
+        if value not in (None, ''):
+            value = get_string_table().intern(lang, value)
+        else:
+            value = None
+        return QuerySet.update(queryset, **{
+            self.string_fields[lang].name: value})
+
+
+def get_translation_table(model, table_class=TranslationTable):
+    try:
+        return _translation_tables[model, table_class]
+    except KeyError:
+        table = _translation_tables[model, table_class] = table_class(model)
+        return table
+
+
+def get_translation_tables(model):
+    """
+    Returns the translation tables of ``model`` and its parents.
+    """
+    opts = model._meta
+    models = [opts.concrete_model] + list(opts.get_parent_list())
+    return [table for (klass, table_class), table
+            in _translation_tables.items() if klass in models]
+
+_translation_tables = {}
+
+
+class TableStorage(TranslationStorage):
+    """
+    Stores the translations as rows of the translation table of the model
+    (see ``TranslationTable``), so missing translations take no space.
+
+    Querysets load the translations of the current language for every chunk
+    of objects in one query. Lookups only touch the rows of one language.
+    """
+    table_class = TranslationTable
+
+    def contribute_to_class(self, translation_opts):
+        self.table = get_translation_table(self.model, self.table_class)
+        self.table.add_field(self)
+        return super(TableStorage, self).contribute_to_class(
+            translation_opts)
+
+    def get_value(self, instance, lang):
+        value = self.table.get_rows(instance, lang).get(self.field_name)
+        if value is None:
+            return value
+        return self.field.to_python(value)
+
+    def set_value(self, instance, lang, value):
+        rows = self.table.get_rows(instance, lang)
+        if value in (None, ''):
+            rows.pop(self.field_name, None)
+        else:
+            rows[self.field_name] = value
+        instance.__dict__.setdefault('_translation_changes', {})[
+            (self.field_name, lang)] = value
+
+    def value_sql(self, qn, connection, alias, lang):
+        return self.table.value_sql(qn, alias, lang, self.field_name)
+
+    def lookup(self, lang, lookup_type, value):
+        rows = self.table.rows(lang, self.field_name)
+        if lookup_type == 'exact' and value is None:
+            lookup_type, value = 'isnull', True
+        if lookup_type == 'isnull':
+            # Missing translations have no row
+            q = Q(pk__in=rows.values('object'))
+            return value and ~q or q
+        return 'pk__in', rows.filter(**{'%s__%s' % (
+            self.table.value_name(self.field_name), lookup_type): value}
+        ).values('object')
+
+    def update(self, queryset, lang, value):
+        pks = list(queryset.values_list('pk', flat=True))
+        self.table.update(pks, lang, self.field_name, value)
+        return len(pks)
+
+
+class PartitionStorage(TableStorage):
+    """
+    Stores the translations in one table per language (see
+    ``TranslationPartitions``), which keeps the table of the model narrow
+    while only the table of the current language is read.
+    """
+    table_class = TranslationPartitions
+
+    def get_fields(self):
+        return [self.table.translation_models[lang]._meta.get_field(
+            self.field_name) for lang in self.languages]
+
+
+STORAGES = {
+    'columns': ColumnStorage,
+    'json': JSONStorage,
+    'table': TableStorage,
+    'partitions': PartitionStorage,
+    'interned': InternedStorage,
+}
+
+
+def get_storage_class(model, field_name, storage):
+    if isinstance(storage, basestring):
+        try:
+            return STORAGES[storage]
+        except KeyError:
+            raise ImproperlyConfigured(
+                "Unknown translation storage '%s' for field '%s' of %s." % (
+                    storage, field_name, model.__name__))
+    return storage
+
+
+def create_translation_storages(model, field_name, translation_opts):
+    """
+    Returns the storages of the translations of ``field_name`` according to
+    the ``storage`` option of ``translation_opts``.
+
+    If the options declare ``hot_languages``, only the translations in these
+    languages (and the default language) use that storage. The translations
+    in all other languages go to the ``cold_storage`` (defaults to
+    ``'json'``).
+    """
+    storage = getattr(translation_opts, 'storage', None)
+    if isinstance(storage, dict):
+        storage = storage.get(field_name)
+    if storage is None:
+        storage = 'columns'
+    storage = get_storage_class(model, field_name, storage)
+    languages = [l[0] for l in settings.LANGUAGES]
+    hot_languages = getattr(translation_opts, 'hot_languages', None)
+    if hot_languages is None:
+        return [storage(model, field_name, languages)]
+    hot_languages = list(hot_languages) + [mt_settings.DEFAULT_LANGUAGE]
+    storages = [storage(model, field_name, [
+        lang for lang in languages if lang in hot_languages])]
+    cold_languages = [lang for lang in languages if lang not in hot_languages]
+    if cold_languages:
+        cold_storage = get_storage_class(
+            model, field_name,
+            getattr(translation_opts, 'cold_storage', 'json'))
+        storages.append(cold_storage(model, field_name, cold_languages))
+    return storages
@@ -10,15 +10,19 @@ from django.conf import settings
 from django.contrib.admin.sites import AdminSite
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models
+from django.db.models import Q
 from django.test import TestCase
 from django.utils.translation import get_language
 from django.utils.translation import trans_real
 from django.utils.translation import ugettext_lazy
 
+from modeltranslation import settings as mt_settings
 from modeltranslation import translator
 from modeltranslation.admin import (TranslationAdmin,
                                     TranslationStackedInline)
+from modeltranslation.storage import (get_translation_tables,
+                                     get_string_table)
 from modeltranslation.tests.settings import DEFAULT_LANGUAGE
 
 # None of the following tests really depend on the content of the request,
@@ -44,11 +48,37 @@ class TestModel(models.Model):
 
 class TestTranslationOptions(translator.TranslationOptions):
     fields = ('title', 'text', 'url', 'email',)
+    translated_manager = 'translated'
 
 translator.translator._registry = {}
 translator.translator.register(TestModel, TestTranslationOptions)
 
 
+class TestModelIndexed(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+    email = models.EmailField(blank=True, null=True)
+
+
+class TestTranslationOptionsIndexed(translator.TranslationOptions):
+    fields = ('title', 'email',)
+    indexes = (translator.TranslationIndex('title', languages=('de',)),
+               translator.TranslationIndex('title', 'email', partial=True),)
+
+translator.translator.register(TestModelIndexed, TestTranslationOptionsIndexed)
+
+
+class TestModelTracked(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+    text = models.TextField(blank=True, null=True)
+
+
+class TestTranslationOptionsTracked(translator.TranslationOptions):
+    fields = ('title', 'text',)
+    track_changes = True
+
+translator.translator.register(TestModelTracked, TestTranslationOptionsTracked)
+
+
 class TestModelWithFallback(models.Model):
     title = models.CharField(ugettext_lazy('title'), max_length=255)
     text = models.TextField(blank=True, null=True)
@@ -80,6 +110,102 @@ translator.translator.register(TestModelWithFallback2,
                                TestTranslationOptionsWithFallback2)
 
 
+class TestModelStorage(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+    text = models.TextField(blank=True, null=True)
+
+
+class TestTranslationOptionsStorage(translator.TranslationOptions):
+    fields = ('title', 'text',)
+    storage = {'title': 'json', 'text': 'table'}
+    translation_status = True
+    translated_manager = 'translated'
+
+translator.translator.register(TestModelStorage,
+                               TestTranslationOptionsStorage)
+
+
+class TestModelPartitions(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+    text = models.TextField(blank=True, null=True)
+
+
+class TestTranslationOptionsPartitions(translator.TranslationOptions):
+    fields = ('title', 'text',)
+    storage = 'partitions'
+    translated_manager = 'translated'
+
+translator.translator.register(TestModelPartitions,
+                               TestTranslationOptionsPartitions)
+
+
+class TestModelHotLanguages(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+
+
+class TestTranslationOptionsHotLanguages(translator.TranslationOptions):
+    fields = ('title',)
+    hot_languages = ()
+    translated_manager = 'translated'
+
+translator.translator.register(TestModelHotLanguages,
+                               TestTranslationOptionsHotLanguages)
+
+
+class TestModelCompressed(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+    text = models.TextField(blank=True, null=True)
+
+
+class TestTranslationOptionsCompressed(translator.TranslationOptions):
+    fields = ('title', 'text',)
+    compress = ('text',)
+    track_changes = True
+    translated_manager = 'translated'
+
+translator.translator.register(TestModelCompressed,
+                               TestTranslationOptionsCompressed)
+
+
+class TestModelDedupe(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+    text = models.TextField(blank=True, null=True)
+
+
+class TestTranslationOptionsDedupe(translator.TranslationOptions):
+    fields = ('title', 'text',)
+    fallback_values = {'text': 'n/a'}
+    dedupe = ('text',)
+
+translator.translator.register(TestModelDedupe, TestTranslationOptionsDedupe)
+
+
+class TestModelCompressedDedupe(models.Model):
+    text = models.TextField(blank=True, null=True)
+
+
+class TestTranslationOptionsCompressedDedupe(translator.TranslationOptions):
+    fields = ('text',)
+    compress = ('text',)
+    dedupe = ('text',)
+
+translator.translator.register(TestModelCompressedDedupe,
+                               TestTranslationOptionsCompressedDedupe)
+
+
+class TestModelInterned(models.Model):
+    title = models.CharField(ugettext_lazy('title'), max_length=255)
+
+
+class TestTranslationOptionsInterned(translator.TranslationOptions):
+    fields = ('title',)
+    storage = 'interned'
+    translated_manager = 'translated'
+
+translator.translator.register(TestModelInterned,
+                               TestTranslationOptionsInterned)
+
+
 class ModeltranslationTestBase(TestCase):
     urls = 'modeltranslation.tests.urls'
 
@@ -103,8 +229,8 @@ class ModeltranslationTest(ModeltranslationTestBase):
         self.failUnless('en' in langs)
         self.failUnless(translator.translator)
 
-        # Check that eight models are registered for translation
-        self.failUnlessEqual(len(translator.translator._registry), 8)
+        # Check that seventeen models are registered for translation
+        self.failUnlessEqual(len(translator.translator._registry), 17)
 
         # Try to unregister a model that is not registered
         self.assertRaises(translator.NotRegistered,
@@ -114,6 +240,83 @@ class ModeltranslationTest(ModeltranslationTestBase):
         self.assertRaises(translator.NotRegistered,
                           translator.translator.get_options_for_model, User)
 
+    def test_handle_translation_registrations(self):
+        from modeltranslation import loading
+        calls = []
+
+        def autodiscover():
+            calls.append(True)
+            # Importing modeltranslation again from a translation module
+            loading.handle_translation_registrations()
+            if len(calls) == 1:
+                raise ImportError
+
+        orig_autodiscover = loading.autodiscover
+        orig_state = loading._registration_state
+        orig_enabled = mt_settings.ENABLE_REGISTRATIONS
+        loading.autodiscover = autodiscover
+        loading._registration_state = loading._RegistrationState()
+        mt_settings.ENABLE_REGISTRATIONS = True
+        try:
+            # A failed call is retried by the next one
+            self.assertRaises(ImportError,
+                              loading.handle_translation_registrations)
+            loading.handle_translation_registrations()
+            loading.handle_translation_registrations()
+            self.assertEqual(len(calls), 2)
+            self.assertTrue(loading._registration_state.done)
+        finally:
+            loading.autodiscover = orig_autodiscover
+            loading._registration_state = orig_state
+            mt_settings.ENABLE_REGISTRATIONS = orig_enabled
+
+    def test_frozen_lookups(self):
+        trans = translator.translator
+        trans.freeze()
+        lookups = trans.get_lookups(TestModel)
+        self.assertTrue(trans._lookups[TestModel] is lookups)
+        self.assertEqual(lookups.fields, ('title', 'text', 'url', 'email'))
+        self.assertRaises(TypeError, lookups.attnames.__setitem__,
+                          ('title', 'en'), 'title_fr')
+        self.assertRaises(TypeError, lookups.translations.update, {})
+        self.assertTrue(trans._field_models is not None)
+        self.assertTrue(TestModel in trans.get_models_for_field('title'))
+        self.assertFalse(TestModel in trans.get_models_for_field('titlea'))
+        self.assertEqual(trans.get_models_for_field('titlec'),
+                         (TestModelMultitableC,))
+        self.assertEqual(trans.get_models_for_field('unknown'), ())
+        self.assertRaises(TypeError, trans._field_models.pop, 'title')
+        self.assertEqual(
+            trans.get_localized_fieldname(TestModel, 'title', 'en'),
+            'title_en')
+        self.assertEqual(trans.split_localized_fieldname(TestModel, 'url_de'),
+                         ('url', 'de'))
+        self.assertEqual(trans.split_localized_fieldname(TestModel, 'url'),
+                         None)
+        # Inherited translated fields are compiled on demand
+        self.assertEqual(
+            trans.split_localized_fieldname(TestModelMultitableC,
+                                            'titlea_en'), ('titlea', 'en'))
+
+        # Changing the registry discards the compiled lookups
+        registry = trans._registry
+        trans._registry = registry.copy()
+        try:
+            trans.unregister(TestModelMultitableC)
+            self.assertEqual(trans._lookups, {})
+            self.assertEqual(trans._field_models, None)
+            self.assertEqual(trans.get_models_for_field('titlec'), ())
+            self.assertEqual(
+                trans.split_localized_fieldname(TestModelMultitableC,
+                                                'titlec_en'), None)
+        finally:
+            trans._registry = registry
+        self.assertEqual(
+            trans.split_localized_fieldname(TestModelMultitableC,
+                                            'titlec_en'), ('titlec', 'en'))
+        self.assertEqual(trans.get_models_for_field('titlec'),
+                         (TestModelMultitableC,))
+
     def test_translated_models(self):
         # First create an instance of the test model to play with
         inst = TestModel.objects.create(title="Testtitle", text="Testtext")
@@ -172,9 +375,10 @@ class ModeltranslationTest(ModeltranslationTestBase):
         self.failUnlessEqual(n.title, title1_de)
         # Because the original field "title" was specified in the constructor
         # it is directly passed into the instance's __dict__ and the descriptor
-        # which updates the associated default translation field is not called
-        # and the default translation will be None.
-        self.failUnlessEqual(n.title_de, None)
+        # which updates the associated default translation field is not called.
+        # Inserting the row fills the empty default translation from the
+        # original field.
+        self.failUnlessEqual(n.title_de, title1_de)
         self.failUnlessEqual(n.title_en, None)
 
         # Now assign the title, that triggers the descriptor and the default
@@ -184,6 +388,187 @@ class ModeltranslationTest(ModeltranslationTestBase):
         self.failUnlessEqual(n.title_de, title1_de)
         self.failUnlessEqual(n.title_en, None)
 
+    def test_descriptor_localized_fieldnames(self):
+        descriptor = TestModel.__dict__['title']
+        self.assertEqual(descriptor.localized_fieldnames,
+                         {'de': 'title_de', 'en': 'title_en'})
+
+        n = TestModel(title_de='title de', title_en='title en')
+        self.failUnlessEqual(n.title, 'title de')
+        trans_real.activate('en')
+        self.failUnlessEqual(n.title, 'title en')
+
+    def test_load_keeps_deferred_translation_fields(self):
+        n = TestModel.objects.create(title_de='title de', title_en='title en')
+        trans_real.activate('en')
+        # Loading the original field must not overwrite the deferred
+        # translation field of the current language.
+        n = TestModel.objects.defer('title_en').get(pk=n.pk)
+        self.failIf('title_en' in n.__dict__)
+        self.failUnlessEqual(n.title_en, 'title en')
+        self.failUnlessEqual(n.title, 'title en')
+
+    def test_get_language(self):
+        from modeltranslation.utils import get_language as mt_get_language
+        self.failUnlessEqual(mt_get_language(), 'de')
+        trans_real.activate('en')
+        self.failUnlessEqual(mt_get_language(), 'en')
+        # Regional variants resolve to their generic language
+        trans_real.activate('de-at')
+        self.failUnlessEqual(mt_get_language(), 'de')
+        trans_real.activate('en-us')
+        self.failUnlessEqual(mt_get_language(), 'en')
+        # Unknown languages resolve to the default language
+        trans_real.activate('fr')
+        self.failUnlessEqual(mt_get_language(), 'de')
+        trans_real.deactivate()
+        trans_real.activate('en')
+        self.failUnlessEqual(mt_get_language(), 'en')
+
+    def test_translation_indexes(self):
+        from django.core.management.color import no_style
+        from django.db import connection
+        statements = translator.sql_translation_indexes(
+            TestModelIndexed, no_style(), connection)
+        self.assertEqual(len(statements), 3)
+        cursor = connection.cursor()
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE "
+                       "type = 'index' AND tbl_name = %s",
+                       [TestModelIndexed._meta.db_table])
+        existing = dict(cursor.fetchall())
+        for name in statements:
+            self.assertTrue(name in existing)
+        # The partial composite index covers only translated rows
+        partial = [sql for sql in existing.values()
+                   if sql and 'WHERE' in sql]
+        self.assertEqual(len(partial), 2)
+        self.assertTrue('"title_en" IS NOT NULL AND "email_en" IS NOT NULL'
+                        in ''.join(partial))
+        self.assertRaises(TypeError, translator.TranslationIndex, 'title',
+                          unique=True)
+        # A partial index needs a translated field to restrict it to
+        from django.core.exceptions import ImproperlyConfigured
+
+        class InvalidTranslationOptions(translator.TranslationOptions):
+            fields = ('reltitle',)
+            indexes = (translator.TranslationIndex('id', partial=True),)
+        self.assertRaises(ImproperlyConfigured, translator.translator.register,
+                          RelatedModel, InvalidTranslationOptions)
+        self.failIf(RelatedModel in translator.translator._registry)
+
+        # sync_translation_fields recreates missing indexes
+        from modeltranslation.management.commands import \
+            sync_translation_fields
+        name = sorted(statements)[0]
+        cursor.execute('DROP INDEX %s' % connection.ops.quote_name(name))
+        command = sync_translation_fields.Command()
+        command.cursor = cursor
+        self.assertEqual(
+            command.get_index_sync_sql(TestModelIndexed, ['title']),
+            [statements[name]])
+
+    def test_translation_triggers(self):
+        from django.core.management.color import no_style
+        from django.db import connection
+        self.assertEqual(translator.get_synced_columns(TestModel),
+                         [('title', 'title_de'), ('text', 'text_de'),
+                          ('url', 'url_de'), ('email', 'email_de')])
+        cursor = connection.cursor()
+        for sql in translator.sql_translation_triggers(TestModel, no_style(),
+                                                       connection):
+            cursor.execute(sql)
+        table = connection.ops.quote_name(TestModel._meta.db_table)
+        try:
+            cursor.execute("INSERT INTO %s (title, title_de, title_en) VALUES "
+                           "('Titel', NULL, 'title')" % table)
+            cursor.execute("INSERT INTO %s (title, title_de) VALUES "
+                           "('foo', 'Titel 2')" % table)
+            self.assertEqual(
+                list(TestModel._base_manager.order_by('pk').values_list(
+                    'title', 'title_de')),
+                [('Titel', 'Titel'), ('Titel 2', 'Titel 2')])
+            # Updating the translation of the default language or the
+            # original field updates the other one
+            cursor.execute("UPDATE %s SET title_de = 'Neu' "
+                           "WHERE title = 'Titel'" % table)
+            TestModel._base_manager.filter(title='Titel 2').update(
+                title='Neu 2')
+            self.assertEqual(
+                list(TestModel._base_manager.order_by('pk').values_list(
+                    'title', 'title_de', 'title_en')),
+                [('Neu', 'Neu', 'title'), ('Neu 2', 'Neu 2', None)])
+            # Removing the translation keeps the original field
+            cursor.execute("UPDATE %s SET title_de = NULL" % table)
+            self.assertEqual(
+                list(TestModel._base_manager.order_by('pk').values_list(
+                    'title', flat=True)), ['Neu', 'Neu 2'])
+            # Saving in another language writes the English title to the
+            # original field, which mustn't replace the German one
+            n = TestModel.objects.create(title_de='Titel', title_en='Title')
+            trans_real.activate('en')
+            n = TestModel.objects.get(pk=n.pk)
+            n.text_en = 'Text'
+            n.save()
+            trans_real.deactivate()
+            self.assertEqual(
+                TestModel._base_manager.filter(pk=n.pk).values_list(
+                    'title', 'title_de', 'title_en')[0],
+                ('Titel', 'Titel', 'Title'))
+        finally:
+            trans_real.deactivate()
+            cursor.execute("SELECT name FROM sqlite_master WHERE "
+                           "type = 'trigger' AND tbl_name = %s",
+                           [TestModel._meta.db_table])
+            for (name,) in cursor.fetchall():
+                cursor.execute('DROP TRIGGER %s'
+                               % connection.ops.quote_name(name))
+
+    def test_save_changed_translation_fields(self):
+        from django.db import connection
+
+        def update_sql(instance):
+            connection.use_debug_cursor = True
+            try:
+                del connection.queries[:]
+                instance.save()
+                return [q['sql'] for q in connection.queries
+                        if q['sql'].startswith('UPDATE')]
+            finally:
+                connection.use_debug_cursor = False
+
+        n = TestModelTracked.objects.create(title='title', title_de='title de',
+                                     title_en='title en')
+        n = TestModelTracked.objects.get(pk=n.pk)
+        self.assertEqual(update_sql(n), [])
+        n.title_en = 'new title en'
+        sql, = update_sql(n)
+        self.assertTrue('"title_en" = ' in sql)
+        self.assertFalse('"title_de" = ' in sql)
+        self.assertFalse('"title" = ' in sql)
+        # Assigning the translated field in the default language updates
+        # the original field as well
+        n.title = 'neuer Titel'
+        sql, = update_sql(n)
+        self.assertTrue('"title" = ' in sql)
+        self.assertTrue('"title_de" = ' in sql)
+        self.assertFalse('"title_en" = ' in sql)
+        self.assertEqual(TestModelTracked._base_manager.values_list(
+            'title', 'title_de', 'title_en').get(pk=n.pk),
+            ('neuer Titel', 'neuer Titel', 'new title en'))
+        # Deferred translation fields are not loaded to save them
+        n = TestModelTracked.objects.defer('title_en').get(pk=n.pk)
+        n.text_de = 'text'
+        sql, = update_sql(n)
+        self.assertTrue('"text_de" = ' in sql)
+        self.assertFalse('"title_en" = ' in sql)
+        self.failIf('title_en' in n.__dict__)
+        self.assertEqual(TestModelTracked.objects.get(pk=n.pk).title_en,
+                         'new title en')
+        # Only the instances of tracked models take snapshots
+        self.assertTrue('_translation_snapshot' in n.__dict__)
+        self.failIf('_translation_snapshot' in
+                    TestModel.objects.create(title='title').__dict__)
+
     def test_fallback_values_1(self):
         """
         If ``fallback_values`` is set to string, all untranslated fields would
@@ -199,6 +584,16 @@ class ModeltranslationTest(ModeltranslationTestBase):
         trans_real.activate("en")
         self.failUnlessEqual(n.title, "")
 
+    def test_save_after_create(self):
+        # The translation field of the default language filled on insert
+        # is kept when saving the object again
+        n = TestModelWithFallback.objects.create(title='y')
+        self.assertEqual(n.title_de, 'y')
+        n.save()
+        self.assertEqual(
+            TestModelWithFallback._base_manager.values_list(
+                'title', 'title_de').get(pk=n.pk), ('y', 'y'))
+
     def test_fallback_values_2(self):
         """
         If ``fallback_values`` is set to ``dict``, all untranslated fields in
@@ -220,6 +615,703 @@ class ModeltranslationTest(ModeltranslationTestBase):
             TestTranslationOptionsWithFallback2.fallback_values['text'])
 
 
+class ModeltranslationQuerySetTest(ModeltranslationTestBase):
+    """Tests for the translation aware managers and querysets."""
+    def test_defer_inactive_languages(self):
+        n = TestModel.objects.create(title_de='title de', title_en='title en')
+        n = TestModel.objects.defer_inactive_languages().get(pk=n.pk)
+        self.failUnless('title_de' in n.__dict__)
+        self.failIf('title_en' in n.__dict__)
+        self.failUnlessEqual(n.title, 'title de')
+        # Deferred fields are loaded on access
+        trans_real.activate('en')
+        self.failUnlessEqual(n.title, 'title en')
+
+    def test_defer_inactive_languages_option(self):
+        n = TestModel.objects.create(title_de='title de', title_en='title en')
+        TestTranslationOptions.defer_inactive_languages = True
+        try:
+            n = TestModel.objects.get(pk=n.pk)
+        finally:
+            del TestTranslationOptions.defer_inactive_languages
+        self.failIf('title_en' in n.__dict__)
+        self.failIf('text_en' in n.__dict__)
+        self.failUnlessEqual(n.title_en, 'title en')
+        self.failUnless('title_en' in TestModel.objects.get(pk=n.pk).__dict__)
+
+    def test_annotate_translations(self):
+        TestModel.objects.create(title_de='title de', title_en='title en')
+        TestModel.objects.create(title='title', title_en='')
+        TestModel.objects.create(title='title', title_de='title de')
+        qs = TestModel.objects.annotate_translations().order_by('pk')
+        self.assertEqual([n.title_translated for n in qs],
+                         ['title de', 'title', 'title de'])
+        trans_real.activate('en')
+        qs = TestModel.objects.annotate_translations('title').order_by('pk')
+        self.assertEqual(list(qs.values_list('title_translated', flat=True)),
+                         ['title en', 'title', 'title de'])
+        self.assertRaises(ValueError,
+                          TestModel.objects.annotate_translations, 'id')
+
+    def test_annotate_translations_fallback_values(self):
+        TestModelWithFallback2.objects.create(title='title', text='text')
+        TestModelWithFallback2.objects.create(title='title', text_de='Text')
+        trans_real.activate('en')
+        # The fallback value comes before the default language, like the
+        # descriptor does
+        for n in TestModelWithFallback2.objects.annotate_translations():
+            self.assertEqual(n.title_translated, 'title')
+            self.assertEqual(
+                n.text_translated,
+                TestTranslationOptionsWithFallback2.fallback_values['text'])
+            self.assertEqual(n.text_translated, n.text)
+
+    def test_annotate_translations_multitable_inheritance(self):
+        TestModelMultitableB.objects.create(titlea='a', titlea_de='a de',
+                                            titleb='b')
+        values = TestModelMultitableB.objects.annotate_translations().values(
+            'titlea_translated', 'titleb_translated')
+        self.assertEqual(list(values), [{'titlea_translated': 'a de',
+                                         'titleb_translated': 'b'}])
+
+    def test_filter_rewrites_translated_fields(self):
+        n1 = TestModel.objects.create(title='foo', title_de='foo de',
+                                      title_en='bar en')
+        n2 = TestModel.objects.create(title='bar', title_de='bar de',
+                                      title_en='foo en')
+        qs = TestModel.translated.all()
+        self.assertEqual(list(qs.filter(title__startswith='foo')), [n1])
+        self.assertEqual(list(qs.exclude(title__startswith='foo')), [n2])
+        trans_real.activate('en')
+        self.assertEqual(list(qs.filter(title__startswith='foo')), [n2])
+        self.assertEqual(TestModel.translated.get(title='bar en'), n1)
+        self.assertEqual(
+            TestModel.translated.filter(
+                Q(title='foo en') | ~Q(text__isnull=False)).count(), 2)
+        # Translation fields are not rewritten
+        self.assertEqual(list(TestModel.translated.filter(title_de='foo de')),
+                         [n1])
+        self.assertEqual(
+            list(TestModel.translated.complex_filter(Q(title='foo en'))),
+            [n2])
+        # The other managers query the original field
+        self.assertEqual(list(TestModel.objects.filter(title='foo de')),
+                         [n1])
+        self.assertEqual(
+            list(TestModel.objects.complex_filter(Q(title='foo en'))), [])
+        self.assertTrue(TestModel._default_manager is TestModel.objects)
+        self.assertEqual(
+            list(TestModel._base_manager.filter(title__startswith='bar')),
+            [n2])
+
+    def test_filter_in_other_language(self):
+        trans_real.activate('en')
+        n = TestModel.objects.create(title='y')
+        self.assertEqual(TestModel.objects.filter(title='y').count(), 1)
+        for i in range(3):
+            self.assertEqual(TestModel.objects.get_or_create(title='y'),
+                             (n, False))
+        # The object created by the translated manager matches its lookups
+        m, created = TestModel.translated.get_or_create(
+            title='z', defaults={'text': 'text'})
+        self.assertTrue(created)
+        self.assertEqual(TestModel.translated.get_or_create(title='z'),
+                         (m, False))
+        self.assertEqual((m.title_en, m.text), ('z', 'text'))
+        self.assertEqual(TestModel.objects.count(), 2)
+
+    def test_translated_manager_name_taken(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        class InvalidTranslationOptions(translator.TranslationOptions):
+            fields = ('reltitle',)
+            translated_manager = 'objects'
+        self.assertRaises(ImproperlyConfigured, translator.translator.register,
+                          RelatedModel, InvalidTranslationOptions)
+        self.failIf(RelatedModel in translator.translator._registry)
+
+    def test_filter_follows_relations(self):
+        b = TestModelMultitableB.objects.create(titlea='a', titlea_de='a de',
+                                                titleb='b', titleb_de='b de')
+        self.assertEqual(
+            list(TestModelMultitableB.translated.filter(
+                testmodelmultitablea_ptr__titlea='a de')), [b])
+        self.assertEqual(
+            TestModelMultitableA.translated.filter(
+                testmodelmultitableb__titleb='b de').count(), 1)
+        self.assertEqual(
+            TestModelMultitableA.translated.filter(
+                testmodelmultitableb__titleb='b').count(), 0)
+        # Inherited translated fields
+        self.assertEqual(
+            list(TestModelMultitableB.translated.filter(titlea='a de')), [b])
+
+    def test_order_by_translated_fields(self):
+        n1 = TestModel.objects.create(title='b', title_de='b', title_en='b')
+        n2 = TestModel.objects.create(title='c', title_de='c', title_en='')
+        n3 = TestModel.objects.create(title='x', title_de='a', title_en='d')
+        qs = TestModel.objects.all()
+        self.assertEqual(list(qs.order_by('title')), [n3, n1, n2])
+        self.assertEqual(list(qs.order_by('-title')), [n2, n1, n3])
+        trans_real.activate('en')
+        self.assertEqual(list(qs.order_by('title')), [n2, n1, n3])
+        # With fallbacks n2 is ordered by its default translation
+        qs = TestModel.objects.with_fallbacks().order_by('title')
+        self.assertEqual(list(qs), [n1, n2, n3])
+        self.assertEqual(list(qs.reverse()), [n3, n2, n1])
+        self.assertEqual(
+            list(TestModel.translated.with_fallbacks().filter(title='d')),
+            [n3])
+
+    def test_values(self):
+        n = TestModel.objects.create(title='title', title_de='title de',
+                                     title_en='', text='text')
+        qs = TestModel.objects.all()
+        self.assertEqual(list(qs.values('id', 'title')),
+                         [{'id': n.pk, 'title': 'title de'}])
+        self.assertEqual(list(qs.values_list('title', 'id')),
+                         [('title de', n.pk)])
+        self.assertEqual(qs.values()[0]['title'], 'title de')
+        self.assertEqual(qs.values()[0]['title_en'], None)
+        trans_real.activate('en')
+        self.assertEqual(list(qs.values_list('title', flat=True)), [None])
+        self.assertEqual(
+            list(qs.with_fallbacks().values_list('title', flat=True)),
+            ['title de'])
+        self.assertEqual(
+            list(TestModel.translated.values('title').filter(title=None)),
+            [{'title': None}])
+
+    def test_values_ordered_with_fallbacks(self):
+        n1 = TestModel.objects.create(title='b', title_de='b')
+        n2 = TestModel.objects.create(title='a', title_de='a')
+        trans_real.activate('en')
+        qs = TestModel.objects.with_fallbacks().order_by('title')
+        self.assertEqual(list(qs.values('title')),
+                         [{'title': 'a'}, {'title': 'b'}])
+        self.assertEqual(list(qs.values_list('title', flat=True)),
+                         ['a', 'b'])
+        self.assertEqual(list(qs.values_list('id', flat=True)),
+                         [n2.pk, n1.pk])
+        self.assertEqual(list(qs.values_list('id', 'title')),
+                         [(n2.pk, 'a'), (n1.pk, 'b')])
+        self.assertEqual(list(qs.values('url')),
+                         [{'url': None}, {'url': None}])
+
+    def test_pickle(self):
+        import pickle
+        n = TestModel.objects.create(title_de='Titel', title_en='')
+        qs = pickle.loads(pickle.dumps(TestModel.objects.all()))
+        self.assertEqual(list(qs), [n])
+        self.assertTrue(isinstance(qs, TestModel.objects.all().__class__))
+        trans_real.activate('en')
+        qs = pickle.loads(pickle.dumps(
+            TestModel.objects.with_fallbacks().values_list('title')))
+        self.assertEqual(list(qs), [('Titel',)])
+        qs = pickle.loads(pickle.dumps(TestModel._base_manager.all()))
+        self.assertEqual(list(qs), [n])
+
+    def test_order_by_collation(self):
+        TestModel.objects.create(title_de='b')
+        TestModel.objects.create(title_de='C')
+        TestModel.objects.create(title_de='a')
+        qs = TestModel.objects.all()
+        self.assertEqual([n.title for n in qs.order_by('title')],
+                         ['C', 'a', 'b'])
+        mt_settings.COLLATIONS['de'] = 'NOCASE'
+        try:
+            self.assertEqual([n.title for n in qs.order_by('title')],
+                             ['a', 'b', 'C'])
+            self.assertEqual([n.title for n in qs.order_by('-title', 'pk')],
+                             ['C', 'b', 'a'])
+            self.assertEqual(
+                [n.title for n in qs.with_fallbacks().order_by('title')],
+                ['a', 'b', 'C'])
+        finally:
+            del mt_settings.COLLATIONS['de']
+
+    def test_update(self):
+        n = TestModel.objects.create(title='title', title_de='title de',
+                                     title_en='title en')
+        qs = TestModel.objects.filter(pk=n.pk)
+        # The default language updates the original field as well
+        qs.update(title='neuer Titel')
+        self.assertEqual(qs.values_list('title', 'title_de', 'title_en')[0],
+                         ('neuer Titel', 'neuer Titel', 'title en'))
+        qs.update(title_de='Titel')
+        self.assertEqual(TestModel._base_manager.values_list(
+            'title', 'title_de', 'title_en').get(pk=n.pk),
+            ('Titel', 'Titel', 'title en'))
+        # Other languages only update their translation field
+        trans_real.activate('en')
+        qs.update(title='new title')
+        self.assertEqual(TestModel._base_manager.values_list(
+            'title', 'title_de', 'title_en').get(pk=n.pk),
+            ('Titel', 'Titel', 'new title'))
+
+    def test_bulk_create(self):
+        TestModel.objects.bulk_create([
+            TestModel(title='title'),
+            TestModel(title_de='title de', title_en='title en'),
+            TestModel(title='title', title_de='title de')])
+        trans_real.activate('en')
+        TestModel.objects.bulk_create([
+            TestModel(title='title', title_de='title de',
+                      title_en='title en')])
+        self.assertEqual(
+            list(TestModel._base_manager.order_by('pk').values_list(
+                'title', 'title_de', 'title_en')),
+            [('title', 'title', None),
+             ('title de', 'title de', 'title en'),
+             ('title de', 'title de', None),
+             ('title de', 'title de', 'title en')])
+
+
+class ModeltranslationStorageTest(ModeltranslationTestBase):
+    """Tests for translations which aren't stored in columns."""
+    def test_json_storage(self):
+        field_names = TestModelStorage._meta.get_all_field_names()
+        self.failUnless('title_translations' in field_names)
+        self.failIf('title_de' in field_names)
+
+        n = TestModelStorage.objects.create(title_de='Titel',
+                                            title_en='title')
+        self.assertEqual(n.title, 'Titel')
+        n = TestModelStorage.objects.get(pk=n.pk)
+        self.assertEqual(n.title_de, 'Titel')
+        self.assertEqual(n.title_en, 'title')
+        self.assertEqual(TestModelStorage._base_manager.values_list(
+            'title', 'title_translations').get(pk=n.pk),
+            ('Titel', '{"de": "Titel", "en": "title"}'))
+        trans_real.activate('en')
+        self.assertEqual(n.title, 'title')
+        n.title = 'new title'
+        self.assertEqual(n.title_en, 'new title')
+        n.save()
+        self.assertEqual(TestModelStorage.objects.get(pk=n.pk).title_en,
+                         'new title')
+
+    def test_json_storage_save_default_language(self):
+        n = TestModelStorage.objects.create(title='Titel')
+        self.assertEqual(TestModelStorage.objects.get(pk=n.pk).title_de,
+                         'Titel')
+        n.title_de = 'Neuer Titel'
+        n.save()
+        self.assertEqual(TestModelStorage._base_manager.get(pk=n.pk).title,
+                         'Neuer Titel')
+
+    def test_json_storage_queries(self):
+        a = TestModelStorage.objects.create(title_de='Apfel',
+                                            title_en='apple')
+        b = TestModelStorage.objects.create(title_de='Birne', title_en='pear')
+        c = TestModelStorage.objects.create(title_de='Quitte')
+        qs = TestModelStorage.translated.all()
+        self.assertEqual(list(qs.filter(title='Birne')), [b])
+        self.assertEqual(list(qs.filter(title_en__icontains='PP')), [a])
+        self.assertEqual(list(qs.filter(title_en__isnull=True)), [c])
+        self.assertEqual(list(qs.exclude(title__startswith='B')), [a, c])
+        self.assertEqual(
+            list(qs.filter(Q(title='Apfel') | Q(title_en='pear'))), [a, b])
+        self.assertEqual([n.title for n in qs.order_by('-title')],
+                         ['Quitte', 'Birne', 'Apfel'])
+        self.assertEqual(
+            list(qs.order_by('pk').values_list('title', 'title_en')),
+            [('Apfel', 'apple'), ('Birne', 'pear'), ('Quitte', None)])
+        trans_real.activate('en')
+        self.assertEqual(list(qs.filter(title='pear')), [b])
+        self.assertEqual(
+            list(qs.with_fallbacks().order_by('title').values_list(
+                'title', flat=True)), ['Quitte', 'apple', 'pear'])
+        self.assertEqual(list(qs.defer_inactive_languages()), [a, b, c])
+
+    def test_json_storage_update(self):
+        n = TestModelStorage.objects.create(title_de='Titel',
+                                            title_en='title')
+        qs = TestModelStorage.objects.filter(pk=n.pk)
+        self.assertEqual(qs.update(title='Neuer Titel'), 1)
+        n = TestModelStorage.objects.get(pk=n.pk)
+        self.assertEqual((n.title_de, n.title_en), ('Neuer Titel', 'title'))
+        self.assertEqual(TestModelStorage._base_manager.get(pk=n.pk).title,
+                         'Neuer Titel')
+        qs.update(title_en=None)
+        n = TestModelStorage.objects.get(pk=n.pk)
+        self.assertEqual((n.title_de, n.title_en), ('Neuer Titel', None))
+
+    def test_table_storage(self):
+        field_names = TestModelStorage._meta.get_all_field_names()
+        self.failIf('text_de' in field_names)
+        Row = get_translation_tables(TestModelStorage)[0].translation_model
+        self.assertEqual(Row._meta.db_table,
+                         'modeltranslation_testmodelstorage_translation')
+
+        n = TestModelStorage.objects.create(title='Titel', text_de='Text')
+        self.assertEqual(n.text, 'Text')
+        self.assertEqual(
+            list(Row.objects.values_list('object', 'language', 'field',
+                                         'value')),
+            [(n.pk, 'de', 'text', 'Text')])
+        self.assertEqual(TestModelStorage._base_manager.get(pk=n.pk).text,
+                         'Text')
+        n.text_de = 'Neuer Text'
+        n.text_en = 'text'
+        n.save()
+        self.assertEqual(TestModelStorage._base_manager.get(pk=n.pk).text,
+                         'Neuer Text')
+        n = TestModelStorage.objects.get(pk=n.pk)
+        self.assertEqual((n.text_de, n.text_en), ('Neuer Text', 'text'))
+        n.text_en = ''
+        n.save()
+        self.assertEqual(Row.objects.filter(language='en').count(), 0)
+        self.assertEqual(TestModelStorage.objects.get(pk=n.pk).text_en, None)
+
+        # Inserting fills the default language from the original field
+        n = TestModelStorage.objects.create(title='Titel', text='Text')
+        self.assertEqual(TestModelStorage.objects.get(pk=n.pk).text_de,
+                         'Text')
+        # Deleting an object deletes its translations
+        n.delete()
+        self.assertEqual(Row.objects.filter(object=n.pk).count(), 0)
+
+    def test_table_storage_prefetch(self):
+        for i in range(5):
+            TestModelStorage.objects.create(title='Titel',
+                                            text_de='Text %d' % i)
+        connection.use_debug_cursor = True
+        try:
+            queries = len(connection.queries)
+            texts = [n.text for n in TestModelStorage.objects.all()]
+            self.assertEqual(len(connection.queries) - queries, 2)
+        finally:
+            connection.use_debug_cursor = None
+        self.assertEqual(texts, ['Text %d' % i for i in range(5)])
+
+    def test_table_storage_queries(self):
+        a = TestModelStorage.objects.create(title='a', text_de='Apfel',
+                                            text_en='apple')
+        b = TestModelStorage.objects.create(title='b', text_de='Birne',
+                                            text_en='pear')
+        c = TestModelStorage.objects.create(title='c', text_de='Quitte')
+        qs = TestModelStorage.translated.all()
+        self.assertEqual(list(qs.filter(text='Birne')), [b])
+        self.assertEqual(list(qs.filter(text_en__icontains='PP')), [a])
+        self.assertEqual(list(qs.filter(text_en__isnull=True)), [c])
+        self.assertEqual(list(qs.filter(text_en=None)), [c])
+        self.assertEqual(list(qs.filter(text_en__isnull=False)), [a, b])
+        self.assertEqual(list(qs.exclude(text__startswith='B')), [a, c])
+        self.assertEqual(
+            list(qs.filter(Q(text='Apfel') | Q(text_en='pear'))), [a, b])
+        self.assertEqual([n.title for n in qs.order_by('-text')],
+                         ['c', 'b', 'a'])
+        self.assertEqual(
+            list(qs.order_by('pk').values_list('title', 'text_en')),
+            [('a', 'apple'), ('b', 'pear'), ('c', None)])
+        trans_real.activate('en')
+        self.assertEqual(list(qs.filter(text='pear')), [b])
+        self.assertEqual(list(qs.with_fallbacks().order_by('text')),
+                         [c, a, b])
+
+    def test_table_storage_update(self):
+        a = TestModelStorage.objects.create(title='a', text_de='Text')
+        b = TestModelStorage.objects.create(title='b')
+        qs = TestModelStorage.objects.all()
+        self.assertEqual(qs.update(text_en='text'), 2)
+        self.assertEqual(list(qs.filter(text_en='text')), [a, b])
+        self.assertEqual(qs.filter(pk=a.pk).update(text='Neuer Text'), 1)
+        self.assertEqual(TestModelStorage.objects.get(pk=a.pk).text_de,
+                         'Neuer Text')
+        self.assertEqual(TestModelStorage._base_manager.get(pk=a.pk).text,
+                         'Neuer Text')
+        qs.update(text_en=None)
+        self.assertEqual(list(qs.filter(text_en__isnull=True)), [a, b])
+
+    def test_partition_storage(self):
+        field_names = TestModelPartitions._meta.get_all_field_names()
+        self.failIf('title_de' in field_names)
+        partitions = get_translation_tables(TestModelPartitions)[0]
+        De = partitions.translation_models['de']
+        En = partitions.translation_models['en']
+        self.assertEqual(En._meta.db_table,
+                         'modeltranslation_testmodelpartitions_en')
+        self.assertEqual([f.name for f in En._meta.fields],
+                         ['object', 'title', 'text'])
+
+        n = TestModelPartitions.objects.create(title_de='Titel',
+                                               text_de='Text')
+        self.assertEqual(list(De.objects.values_list('object', 'title',
+                                                     'text')),
+                         [(n.pk, 'Titel', 'Text')])
+        self.assertEqual(En.objects.count(), 0)
+        n.title_en = 'title'
+        n.save()
+        self.assertEqual(list(En.objects.values_list('object', 'title',
+                                                     'text')),
+                         [(n.pk, 'title', None)])
+        n = TestModelPartitions.objects.get(pk=n.pk)
+        self.assertEqual((n.title_de, n.title_en, n.text_de, n.text_en),
+                         ('Titel', 'title', 'Text', None))
+        trans_real.activate('en')
+        self.assertEqual(n.title, 'title')
+
+        # Only the table of the changed language is written
+        connection.use_debug_cursor = True
+        try:
+            queries = len(connection.queries)
+            n.title_en = 'new title'
+            n.save()
+            sql = ' '.join(q['sql'] for q in connection.queries[queries:])
+        finally:
+            connection.use_debug_cursor = None
+        self.failUnless(En._meta.db_table in sql)
+        self.failIf(De._meta.db_table in sql)
+
+        n.delete()
+        self.assertEqual(De.objects.count() + En.objects.count(), 0)
+
+    def test_partition_storage_queries(self):
+        a = TestModelPartitions.objects.create(title_de='Apfel',
+                                               title_en='apple')
+        b = TestModelPartitions.objects.create(title_de='Birne',
+                                               title_en='pear')
+        c = TestModelPartitions.objects.create(title_de='Quitte')
+        qs = TestModelPartitions.translated.all()
+        self.assertEqual(list(qs.filter(title='Birne')), [b])
+        self.assertEqual(list(qs.filter(title_en__icontains='PP')), [a])
+        self.assertEqual(list(qs.filter(title_en__isnull=True)), [c])
+        self.assertEqual(list(qs.order_by('-title')), [c, b, a])
+        connection.use_debug_cursor = True
+        try:
+            queries = len(connection.queries)
+            titles = [n.title for n in qs]
+            self.assertEqual(len(connection.queries) - queries, 2)
+        finally:
+            connection.use_debug_cursor = None
+        self.assertEqual(titles, ['Apfel', 'Birne', 'Quitte'])
+        trans_real.activate('en')
+        self.assertEqual(list(qs.filter(title='pear')), [b])
+        self.assertEqual(qs.filter(pk__in=[a.pk, c.pk]).update(
+            title='quince'), 2)
+        self.assertEqual([n.title_en for n in qs], ['quince', 'pear',
+                                                    'quince'])
+
+    def test_hot_languages(self):
+        # The default language is always hot
+        field_names = TestModelHotLanguages._meta.get_all_field_names()
+        self.failUnless('title_de' in field_names)
+        self.failIf('title_en' in field_names)
+        self.failUnless('title_translations' in field_names)
+
+        n = TestModelHotLanguages.objects.create(title_de='Titel',
+                                                 title_en='title')
+        qs = TestModelHotLanguages.objects.all()
+        # The column of the cold languages is only read if one is active
+        self.assertEqual(qs.query.deferred_loading,
+                         (set(['title_translations']), True))
+        self.assertEqual(list(qs.values_list('title', flat=True)), ['Titel'])
+        n = qs.get(pk=n.pk)
+        self.failIf('title_translations' in n.__dict__)
+        self.assertEqual(n.title, 'Titel')
+        self.assertEqual(n.title_en, 'title')
+        trans_real.activate('en')
+        qs = TestModelHotLanguages.objects.all()
+        self.assertEqual(qs.query.deferred_loading[0], set())
+        self.assertEqual(qs.get(pk=n.pk).title, 'title')
+        self.assertEqual(
+            TestModelHotLanguages.translated.get(title='title').pk, n.pk)
+        self.assertEqual(qs.get(title_de='Titel').pk, n.pk)
+
+    def test_compressed_fields(self):
+        text = u'Dies ist ein langer Text. ' * 100
+        n = TestModelCompressed.objects.create(title='Titel', text_de=text,
+                                               text_en=u'äöü')
+        raw = TestModelCompressed._base_manager.extra(
+            select={'raw': 'text_de'}).values_list('raw', flat=True).get()
+        self.failUnless(len(raw) < len(text))
+        n = TestModelCompressed.objects.get(pk=n.pk)
+        # Decompressed on first access only
+        self.failIf('text_de' in n.__dict__)
+        self.assertEqual(n.text, text)
+        self.failUnless('text_de' in n.__dict__)
+        self.failIf('text_en' in n.__dict__)
+        self.assertEqual(n.text_en, u'äöü')
+
+        # Untouched compressed translations aren't saved again
+        n = TestModelCompressed.objects.get(pk=n.pk)
+        connection.use_debug_cursor = True
+        try:
+            n.title_de = 'Neuer Titel'
+            n.save()
+            sql = connection.queries[-1]['sql']
+        finally:
+            connection.use_debug_cursor = False
+        self.failIf('text_' in sql)
+        n = TestModelCompressed.objects.get(pk=n.pk)
+        self.assertEqual((n.title, n.text_en), ('Neuer Titel', u'äöü'))
+
+        qs = TestModelCompressed.objects.all()
+        self.assertEqual(list(qs.values_list('text_en', 'title')),
+                         [(u'äöü', 'Neuer Titel')])
+        self.assertEqual(list(qs.values_list('text', flat=True)), [text])
+        self.assertEqual(list(qs.values('text')), [{'text': text}])
+        self.assertEqual(list(qs.filter(text_en__isnull=False)), [n])
+        # The original field isn't compressed
+        self.assertEqual(list(qs.filter(text=text)), [n])
+        self.assertEqual(
+            list(TestModelCompressed.translated.filter(text=text)), [n])
+        self.assertRaises(TypeError, qs.filter, text_de=text)
+
+        # Compressed translations are counted by isnull lookups only
+        from modeltranslation.management.commands import \
+            translation_language_stats
+        self.assertEqual(translation_language_stats.count_translations(
+            TestModelCompressed, 'text', 'en'), 1)
+        self.assertEqual(translation_language_stats.count_translations(
+            TestModelCompressed, 'title', 'en'), 0)
+        import sys
+        from StringIO import StringIO
+        from django.core.management import call_command
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            call_command('translation_language_stats')
+            output = sys.stdout.getvalue()
+            sys.stdout.truncate(0)
+            call_command('translation_language_stats', verbosity=0)
+            quiet_output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        self.assertTrue('TestModelCompressed (1 objects)\n'
+                        '  de: title 1, text 1\n'
+                        '  en: title 0, text 1\n' in output)
+        self.assertEqual(quiet_output, '')
+
+    def test_dedupe(self):
+        n = TestModelDedupe.objects.create(title_de='Titel', title_en='Titel',
+                                           text_de='Text', text_en='Text')
+        self.assertEqual(n.text_en, 'Text')
+        raw = TestModelDedupe._base_manager.values_list(
+            'title_en', 'text_en').get(pk=n.pk)
+        self.assertEqual(raw, ('Titel', None))
+        n = TestModelDedupe.objects.get(pk=n.pk)
+        self.assertEqual(n.text_en, None)
+        trans_real.activate('en')
+        # Falls back to the default language before the fallback value
+        self.assertEqual(n.text, 'Text')
+        n.text_en = 'text'
+        n.save()
+        self.assertEqual(TestModelDedupe.objects.get(pk=n.pk).text, 'text')
+        n.text_de = 'text'
+        n.text_en = ''
+        n.save()
+        self.assertEqual(TestModelDedupe.objects.get(pk=n.pk).text, 'text')
+
+        # The command deduplicates existing rows
+        from django.core.management import call_command
+        m = TestModelDedupe.objects.create(title='Titel', text_de='Text')
+        TestModelDedupe._base_manager.update(text_en='Text')
+        call_command('dedupe_translations', verbosity=0, chunk_size=1)
+        self.assertEqual(
+            list(TestModelDedupe._base_manager.order_by('pk').values_list(
+                'text_en', flat=True)), ['Text', None])
+        self.assertEqual(TestModelDedupe.objects.get(pk=m.pk).text, 'Text')
+
+    def test_dedupe_compressed(self):
+        from django.core.management import call_command
+        a = TestModelCompressedDedupe.objects.create(text_de=u'Text äöü',
+                                                     text_en=u'text')
+        b = TestModelCompressedDedupe.objects.create(text_de=u'Text äöü')
+        TestModelCompressedDedupe._base_manager.filter(pk=b.pk).update(
+            text_en=u'Text äöü')
+        self.assertEqual(
+            TestModelCompressedDedupe.objects.get(pk=b.pk).text_en,
+            u'Text äöü')
+        call_command('dedupe_translations', verbosity=0)
+        self.assertEqual(
+            [n.text_en for n in
+             TestModelCompressedDedupe.objects.order_by('pk')],
+            [u'text', None])
+        self.assertEqual(
+            TestModelCompressedDedupe.objects.get(pk=b.pk).text_de,
+            u'Text äöü')
+
+    def test_translation_status(self):
+        a = TestModelStorage.objects.create(title_de='Titel', title_en='title')
+        b = TestModelStorage.objects.create(title_de='Titel', text_en='text')
+        c = TestModelStorage.objects.create(title_de='Titel')
+        self.assertEqual(
+            list(TestModelStorage._base_manager.order_by('pk').values_list(
+                'translated_de', 'translated_en')),
+            [(True, True), (True, True), (True, False)])
+        qs = TestModelStorage.objects.order_by('pk')
+        self.assertEqual(list(qs.translated_into('en')), [a, b])
+        self.assertEqual(list(qs.missing_translation('en')), [c])
+        self.assertEqual(list(TestModelStorage.objects.missing_translation(
+            'de')), [])
+        self.assertRaises(ValueError, TestModel.objects.translated_into, 'en')
+
+        b = TestModelStorage.objects.get(pk=b.pk)
+        b.text_en = ''
+        b.save()
+        self.assertEqual(list(qs.missing_translation('en')), [b, c])
+        qs.filter(pk=c.pk).update(text_en='text')
+        qs.filter(pk=a.pk).update(title_en=None)
+        self.assertEqual(list(qs.translated_into('en')), [c])
+
+        # The command recomputes the status of all objects
+        from django.core.management import call_command
+        TestModelStorage._base_manager.update(translated_en=False)
+        call_command('update_translation_status', verbosity=0, chunk_size=2)
+        self.assertEqual(list(qs.translated_into('en')), [c])
+        self.assertEqual(list(qs.translated_into('de')), [a, b, c])
+
+    def test_interned_storage(self):
+        strings = get_string_table()
+        strings.cache.clear()
+        String = strings.string_model
+        a = TestModelInterned.objects.create(title_de='Rot', title_en='red')
+        b = TestModelInterned.objects.create(title_de='Rot', title_en='red')
+        c = TestModelInterned.objects.create(title_de='Blau')
+        self.assertEqual(String.objects.count(), 3)
+        self.assertEqual(a.title_de_string_id, b.title_de_string_id)
+        self.assertEqual(
+            String.objects.get(pk=c.title_de_string_id).language, 'de')
+        self.assertEqual(TestModelInterned._base_manager.get(pk=c.pk).title,
+                         'Blau')
+
+        qs = TestModelInterned.translated.all()
+        self.assertEqual(list(qs.filter(title='Rot')), [a, b])
+        self.assertEqual(list(qs.filter(title_en__startswith='r')), [a, b])
+        self.assertEqual(list(qs.filter(title_en=None)), [c])
+        self.assertEqual(list(qs.order_by('title', 'pk')), [c, a, b])
+        self.assertEqual(
+            list(qs.order_by('pk').values_list('title_en', flat=True)),
+            ['red', 'red', None])
+
+        # Strings are loaded once per chunk and then cached
+        strings.cache.clear()
+        connection.use_debug_cursor = True
+        try:
+            queries = len(connection.queries)
+            qs = qs.order_by('pk')
+            self.assertEqual([n.title for n in qs], ['Rot', 'Rot', 'Blau'])
+            self.assertEqual(len(connection.queries) - queries, 2)
+            self.assertEqual([n.title for n in qs.all()],
+                             ['Rot', 'Rot', 'Blau'])
+            self.assertEqual(len(connection.queries) - queries, 3)
+        finally:
+            connection.use_debug_cursor = None
+
+        c.title_en = 'blue'
+        c.save()
+        trans_real.activate('en')
+        self.assertEqual(TestModelInterned.objects.get(pk=c.pk).title,
+                         'blue')
+        self.assertEqual(qs.filter(title='red').update(title='crimson'), 2)
+        self.assertEqual(
+            list(qs.order_by('pk').values_list('title', flat=True)),
+            ['crimson', 'crimson', 'blue'])
+        self.assertEqual(String.objects.count(), 5)
+
+
 class ModeltranslationTestRule1(ModeltranslationTestBase):
     """
     Rule 1: Reading the value from the original field returns the value in
@@ -757,12 +1849,22 @@ class TestModelAbstractB(TestModelAbstractA):
     titleb = models.CharField(ugettext_lazy('title b'), max_length=255)
 
 
+class TestModelBatchA(models.Model):
+    titlea = models.CharField(ugettext_lazy('title a'), max_length=255)
+
+
+class TestModelBatchB(TestModelBatchA):
+    titleb = models.CharField(ugettext_lazy('title b'), max_length=255)
+
+
 class TranslationOptionsTestModelMultitableA(translator.TranslationOptions):
     fields = ('titlea',)
+    translated_manager = 'translated'
 
 
 class TranslationOptionsTestModelMultitableB(translator.TranslationOptions):
     fields = ('titleb',)
+    translated_manager = 'translated'
 
 
 class TranslationOptionsTestModelMultitableC(translator.TranslationOptions):
@@ -831,6 +1933,86 @@ class ModeltranslationInheritanceTest(ModeltranslationTestBase):
         self.failUnless('titleb_en' in field_names_d)
         self.failUnless('titled' in field_names_d)
 
+    def test_batch_registration(self):
+        class BatchTranslationOptions(translator.TranslationOptions):
+            fields = ('titlea',)
+
+        trans = translator.translator
+        # Fill the field caches of the child model
+        self.assertFalse(
+            'titlea_de' in TestModelBatchB._meta.get_all_field_names())
+        try:
+            with trans.batch():
+                trans.register(TestModelBatchA, BatchTranslationOptions)
+                # The caches of the related models are kept until the end
+                self.assertFalse(
+                    'titlea_de' in TestModelBatchB._meta.get_all_field_names())
+            self.assertTrue(
+                'titlea_de' in TestModelBatchB._meta.get_all_field_names())
+            self.assertEqual(trans._batch, None)
+        finally:
+            trans.unregister(TestModelBatchA)
+
+    def test_registry_journal(self):
+        trans = translator.translator
+        opts_b = trans._registry[TestModelMultitableB]
+        opts_c = trans._registry[TestModelMultitableC]
+        outer = trans.start_journal()
+        try:
+            inner = trans.start_journal()
+            trans.unregister(TestModelMultitableC)
+            self.assertRaises(ValueError, trans.end_journal, outer)
+            trans.end_journal(inner)
+            self.assertEqual(outer, [(TestModelMultitableC, opts_c)])
+            inner = trans.start_journal()
+            trans.unregister(TestModelMultitableB)
+            trans.end_journal(inner, rollback=True)
+            self.assertTrue(trans._registry[TestModelMultitableB] is opts_b)
+            self.assertEqual(
+                trans.get_options_for_model(TestModelMultitableC).fields,
+                ('titleb',))
+        finally:
+            trans.end_journal(outer, rollback=True)
+        self.assertTrue(trans._registry[TestModelMultitableC] is opts_c)
+        self.assertTrue(trans.get_options_for_model(TestModelMultitableC)
+                        is opts_c)
+
+    def test_autodiscover_timings(self):
+        from modeltranslation import loading
+        loading.autodiscover()
+        self.assertEqual([t.app for t in loading.autodiscover_timings],
+                         list(settings.INSTALLED_APPS))
+        for timing in loading.autodiscover_timings:
+            self.assertFalse(timing.found)
+            self.assertEqual(timing.registered, 0)
+            self.assertTrue(timing.import_time >= timing.journal_time >= 0)
+
+    def test_inherited_options_cache(self):
+        trans = translator.translator
+        opts_d = trans.get_options_for_model(TestModelMultitableD)
+        self.assertEqual(opts_d.fields, ('titleb',))
+        self.assertTrue(
+            trans.get_options_for_model(TestModelMultitableD) is opts_d)
+        self.assertRaises(translator.NotRegistered,
+                          trans.get_options_for_model, User)
+        self.assertTrue(trans._options_cache[User] is None)
+
+        # Unregistering a model invalidates the cached options
+        registry = trans._registry
+        trans._registry = registry.copy()
+        try:
+            trans.unregister(TestModelMultitableC)
+            self.assertFalse(User in trans._options_cache)
+            # Falls back to the options of the registered parent
+            self.assertEqual(
+                trans.get_options_for_model(TestModelMultitableC).fields,
+                ('titleb',))
+        finally:
+            trans._registry = registry
+        # So does replacing the registry as a whole
+        opts_c = trans.get_options_for_model(TestModelMultitableC)
+        self.assertTrue(opts_c is registry[TestModelMultitableC])
+
 
 class TranslationAdminTest(ModeltranslationTestBase):
     def setUp(self):
@@ -866,6 +2048,16 @@ class TranslationAdminTest(ModeltranslationTestBase):
         self.assertEqual(ma.get_fieldsets(request, self.test_obj),
             [(None, {'fields': fields})])
 
+    def test_translation_field_excludes(self):
+        class TestModelAdmin(TranslationAdmin):
+            pass
+
+        ma = TestModelAdmin(TestModel, self.site)
+        self.assertEqual(
+            sorted(ma.get_translation_field_excludes(['en'])),
+            ['email_en', 'text_en', 'title_en', 'url_en'])
+        self.assertEqual(ma.get_translation_field_excludes(), ())
+
     def test_field_arguments(self):
         class TestModelAdmin(TranslationAdmin):
             fields = ['title']
@@ -1,9 +1,23 @@
 # -*- coding: utf-8 -*-
+from contextlib import contextmanager
+
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.util import truncate_name
+from django.db.models import get_models, signals
 from django.db.models.base import ModelBase
+from django.db.models.fields import CharField, TextField
+from django.utils.encoding import smart_unicode
 
+from modeltranslation import settings as mt_settings
 from modeltranslation.fields import (TranslationFieldDescriptor,
-                                     create_translation_field)
+                                    TranslationStatusField)
+from modeltranslation.manager import (patch_managers, get_translated_fields,
+                                     get_translation_descriptor,
+                                     CurrentLanguageManager)
+from modeltranslation.storage import (create_translation_storages,
+                                     is_deduplicated, check_localized_name,
+                                     quote_literal)
 from modeltranslation.utils import build_localized_fieldname
 
 
@@ -29,35 +43,348 @@ class TranslationOptions(object):
         self.localized_fieldnames = []
 
 
+class TranslationIndex(object):
+    """
+    Declares a database index on translation fields. Indexes are declared in
+    the ``indexes`` attribute of the ``TranslationOptions`` of a model::
+
+        class NewsTranslationOptions(TranslationOptions):
+            fields = ('title', 'slug',)
+            indexes = (TranslationIndex('title', languages=('de', 'en')),
+                       TranslationIndex('slug', 'site', partial=True),)
+
+    An index is created for every language in ``languages`` (defaults to all
+    languages). Translated fields are replaced by their translation field of
+    the respective language, other fields are indexed as they are. A
+    ``partial`` index only covers rows where the translation fields are not
+    ``NULL``, which isn't supported by MySQL.
+    """
+    def __init__(self, *fields, **kwargs):
+        self.fields = fields
+        self.languages = kwargs.pop('languages', None)
+        self.partial = kwargs.pop('partial', False)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments to '
+                            'TranslationIndex: %s' % kwargs.keys())
+
+    def validate(self, model, translated_fields):
+        """
+        Raises ``ImproperlyConfigured`` if the index is partial but contains
+        none of the ``translated_fields`` of ``model``, as there would be no
+        condition to restrict it to.
+        """
+        if self.partial and not [field_name for field_name in self.fields
+                                 if field_name in translated_fields]:
+            raise ImproperlyConfigured(
+                'The partial translation index on %s of %s contains no '
+                'translated field.' % (', '.join(self.fields),
+                                        model.__name__))
+
+    def get_languages(self):
+        if self.languages is None:
+            return [l[0] for l in settings.LANGUAGES]
+        return self.languages
+
+    def get_columns(self, model, lang):
+        """
+        Returns a list of ``(column, translated)`` tuples of the index for
+        ``lang``.
+        """
+        translated_fields = translator.get_options_for_model(model).fields
+        columns = []
+        for field_name in self.fields:
+            translated = field_name in translated_fields
+            if translated:
+                field_name = translator.get_localized_fieldname(
+                    model, field_name, lang)
+            columns.append(
+                (model._meta.get_field(field_name).column, translated))
+        return columns
+
+    def get_name(self, model, lang, connection):
+        columns = [column for column, translated in
+                   self.get_columns(model, lang)]
+        if self.partial:
+            columns.append('partial')
+        return truncate_name(
+            '%s_%s' % (model._meta.db_table,
+                       connection.creation._digest(*columns)),
+            connection.ops.max_name_length())
+
+    def sql_create(self, model, lang, style, connection):
+        """
+        Returns the CREATE INDEX statement of the index for ``lang``.
+        """
+        qn = connection.ops.quote_name
+        columns = self.get_columns(model, lang)
+        sql = '%s %s %s %s (%s)' % (
+            style.SQL_KEYWORD('CREATE INDEX'),
+            style.SQL_TABLE(qn(self.get_name(model, lang, connection))),
+            style.SQL_KEYWORD('ON'),
+            style.SQL_TABLE(qn(model._meta.db_table)),
+            ', '.join(style.SQL_FIELD(qn(column))
+                      for column, translated in columns))
+        if self.partial and connection.vendor != 'mysql':
+            sql += ' %s %s' % (
+                style.SQL_KEYWORD('WHERE'),
+                ' AND '.join('%s IS NOT NULL' % style.SQL_FIELD(qn(column))
+                             for column, translated in columns if translated))
+        return sql + ';'
+
+
+def sql_translation_indexes(model, style, connection):
+    """
+    Returns a dict mapping the names of the indexes declared in the
+    translation options of ``model`` to their CREATE INDEX statement.
+    """
+    indexes = getattr(translator.get_options_for_model(model), 'indexes', ())
+    output = {}
+    for index in indexes or ():
+        for lang in index.get_languages():
+            output[index.get_name(model, lang, connection)] = \
+                index.sql_create(model, lang, style, connection)
+    return output
+
+
+def _get_synced_fields(model):
+    """
+    Yields ``(field_name, original, default_field)`` tuples of the fields of
+    ``model`` covered by ``sql_translation_triggers``.
+    """
+    opts = translator.get_options_for_model(model)
+    local_fields = model._meta.local_fields
+    for field_name in opts.fields:
+        original = model._meta.get_field(field_name)
+        storage = opts.storages[field_name][mt_settings.DEFAULT_LANGUAGE]
+        if (original not in local_fields or not storage.concrete or
+                not isinstance(original, (CharField, TextField))):
+            continue
+        default_field = model._meta.get_field(
+            translator.get_localized_fieldname(
+                model, field_name, mt_settings.DEFAULT_LANGUAGE))
+        if getattr(default_field, 'compressed', False):
+            continue
+        yield field_name, original, default_field
+
+
+def get_synced_columns(model):
+    """
+    Returns ``(column, default_column)`` tuples of the original fields of
+    ``model`` and the translation fields of the default language kept in
+    sync by ``sql_translation_triggers``. Only text-like fields stored in
+    the table of ``model`` are covered.
+    """
+    return [(original.column, default_field.column) for field_name,
+            original, default_field in _get_synced_fields(model)]
+
+
+def _get_descriptor_values(model, field_name):
+    """
+    Returns the columns of the translations of ``field_name`` in the other
+    languages and the fallback value, which ``save`` writes to the original
+    column when reading the field through its descriptor in a language other
+    than the default language.
+    """
+    opts = translator.get_options_for_model(model)
+    columns = []
+    for lang in mt_settings.AVAILABLE_LANGUAGES:
+        if (lang == mt_settings.DEFAULT_LANGUAGE or
+                not opts.storages[field_name][lang].concrete):
+            continue
+        field = model._meta.get_field(
+            translator.get_localized_fieldname(model, field_name, lang))
+        if not getattr(field, 'compressed', False):
+            columns.append(field.column)
+    descriptor = get_translation_descriptor(model, field_name)
+    return columns, getattr(descriptor, 'fallback_value', None)
+
+
+def sql_translation_triggers(model, style, connection):
+    """
+    Returns the statements installing database triggers which keep the
+    original fields of ``model`` and the translation fields of the default
+    language in sync, like ``TranslationField.pre_save`` does:
+
+    * Inserting a row fills the empty translation field of the default
+      language from the original field, otherwise the original field is set
+      to the translation field.
+    * Updating the translation field of the default language to a value
+      updates the original field.
+    * Updating only the original field updates the translation field of the
+      default language.
+
+    Saving an object while another language is active stores the value read
+    through the descriptor in the original field, which is the translation
+    in that language or the fallback value. Such values (and empty ones)
+    don't update the translation field of the default language, the
+    original field is set to the translation instead.
+
+    SQLite, PostgreSQL and MySQL are supported, ``None`` is returned for
+    other databases.
+    """
+    fields = list(_get_synced_fields(model))
+    if not fields:
+        return []
+    qn = connection.ops.quote_name
+    db_table = model._meta.db_table
+    max_length = connection.ops.max_name_length()
+    name = truncate_name('%s_modeltranslation' % db_table, max_length)
+    # Leaves room for the suffixes of the trigger names
+    suffixed_length = max_length - 4 if max_length else None
+    # The null-safe equality operator of each database
+    equals = {'sqlite': 'IS', 'postgresql': 'IS NOT DISTINCT FROM',
+              'mysql': '<=>'}.get(connection.vendor)
+    if equals is None:
+        return None
+    columns = []
+    for field_name, original, default_field in fields:
+        column = qn(original.column)
+        others, fallback_value = _get_descriptor_values(model, field_name)
+        # Whether the new value of the original field might have been read
+        # through the descriptor
+        read = ["NEW.%s IS NULL" % column, "NEW.%s = ''" % column]
+        read.extend('NEW.%s %s NEW.%s' % (column, equals, qn(other))
+                    for other in others)
+        if fallback_value not in (None, ''):
+            read.append('NEW.%s = %s' % (
+                column, quote_literal(smart_unicode(fallback_value))))
+        columns.append((column, qn(default_field.column),
+                        '(%s)' % ' OR '.join(read)))
+    if connection.vendor == 'sqlite':
+        pk = qn(model._meta.pk.column)
+        output = []
+        for column, default, read in columns:
+            trigger = truncate_name(
+                '%s_%s' % (name, connection.creation._digest(column)),
+                suffixed_length)
+            update = 'UPDATE %s SET %%s = NEW.%%s WHERE %s = NEW.%s;' % (
+                qn(db_table), pk, pk)
+            for suffix, event, condition, assignment in (
+                    ('_ins', 'INSERT', "NEW.%(default)s IS NULL OR "
+                     "NEW.%(default)s = ''", (default, column)),
+                    ('_ind', 'INSERT', "NEW.%(default)s IS NOT NULL AND "
+                     "NEW.%(default)s != '' AND NEW.%(column)s IS NOT "
+                     "NEW.%(default)s", (column, default)),
+                    ('_upd', 'UPDATE OF %(default)s', "NEW.%(default)s IS "
+                     "NOT NULL AND NEW.%(default)s IS NOT OLD.%(default)s "
+                     "AND NEW.%(column)s IS NOT NEW.%(default)s",
+                     (column, default)),
+                    ('_upo', 'UPDATE OF %(column)s', "NEW.%(column)s IS NOT "
+                     "OLD.%(column)s AND NEW.%(default)s IS OLD.%(default)s "
+                     "AND NEW.%(default)s IS NOT NEW.%(column)s AND NOT "
+                     "%(read)s", (default, column)),
+                    ('_upr', 'UPDATE OF %(column)s', "NEW.%(default)s IS "
+                     "OLD.%(default)s AND NEW.%(default)s IS NOT NULL AND "
+                     "NEW.%(default)s IS NOT NEW.%(column)s AND %(read)s",
+                     (column, default))):
+                names = {'column': column, 'default': default, 'read': read}
+                output.append('DROP TRIGGER IF EXISTS %s;' % qn(
+                    trigger + suffix))
+                output.append('%s %s %s %s %s %s %s %s %s %s' % (
+                    style.SQL_KEYWORD('CREATE TRIGGER'),
+                    qn(trigger + suffix), style.SQL_KEYWORD('AFTER'),
+                    event % names, style.SQL_KEYWORD('ON'),
+                    style.SQL_TABLE(qn(db_table)),
+                    style.SQL_KEYWORD('WHEN'), condition % names,
+                    style.SQL_KEYWORD('BEGIN'),
+                    update % assignment + ' END;'))
+        return output
+    if connection.vendor == 'postgresql':
+        body = []
+        for column, default, read in columns:
+            names = {'column': column, 'default': default, 'read': read}
+            body.append(
+                "IF TG_OP = 'INSERT' THEN "
+                "IF NEW.%(default)s IS NULL OR NEW.%(default)s = '' THEN "
+                "NEW.%(default)s := NEW.%(column)s; "
+                "ELSE NEW.%(column)s := NEW.%(default)s; END IF; "
+                "ELSIF NEW.%(default)s IS DISTINCT FROM OLD.%(default)s THEN "
+                "IF NEW.%(default)s IS NOT NULL THEN "
+                "NEW.%(column)s := NEW.%(default)s; END IF; "
+                "ELSIF NEW.%(column)s IS DISTINCT FROM NEW.%(default)s THEN "
+                "IF %(read)s THEN "
+                "IF NEW.%(default)s IS NOT NULL THEN "
+                "NEW.%(column)s := NEW.%(default)s; END IF; "
+                "ELSIF NEW.%(column)s IS DISTINCT FROM OLD.%(column)s THEN "
+                "NEW.%(default)s := NEW.%(column)s; END IF; END IF;" % names)
+        return [
+            '%s %s() RETURNS trigger AS $$ BEGIN %s RETURN NEW; END; $$ '
+            'LANGUAGE plpgsql;' % (
+                style.SQL_KEYWORD('CREATE OR REPLACE FUNCTION'), qn(name),
+                ' '.join(body)),
+            'DROP TRIGGER IF EXISTS %s ON %s;' % (qn(name), qn(db_table)),
+            '%s %s BEFORE INSERT OR UPDATE ON %s FOR EACH ROW EXECUTE '
+            'PROCEDURE %s();' % (
+                style.SQL_KEYWORD('CREATE TRIGGER'), qn(name),
+                style.SQL_TABLE(qn(db_table)), qn(name)),
+        ]
+    output = []
+    for suffix, event, template in (
+            ('_ins', 'INSERT',
+             "IF NEW.%(default)s IS NULL OR NEW.%(default)s = '' THEN "
+             "SET NEW.%(default)s = NEW.%(column)s; "
+             "ELSE SET NEW.%(column)s = NEW.%(default)s; END IF;"),
+            ('_upd', 'UPDATE',
+             "IF NOT (NEW.%(default)s <=> OLD.%(default)s) THEN "
+             "IF NEW.%(default)s IS NOT NULL THEN "
+             "SET NEW.%(column)s = NEW.%(default)s; END IF; "
+             "ELSEIF NOT (NEW.%(column)s <=> NEW.%(default)s) THEN "
+             "IF %(read)s THEN "
+             "IF NEW.%(default)s IS NOT NULL THEN "
+             "SET NEW.%(column)s = NEW.%(default)s; END IF; "
+             "ELSEIF NOT (NEW.%(column)s <=> OLD.%(column)s) THEN "
+             "SET NEW.%(default)s = NEW.%(column)s; END IF; END IF;")):
+        trigger = qn(truncate_name(name, suffixed_length) + suffix)
+        output.append('DROP TRIGGER IF EXISTS %s;' % trigger)
+        output.append('%s %s BEFORE %s ON %s FOR EACH ROW BEGIN %s '
+                      'END;' % (
+            style.SQL_KEYWORD('CREATE TRIGGER'), trigger, event,
+            style.SQL_TABLE(qn(db_table)), ' '.join(
+                template % {'column': column, 'default': default,
+                            'read': read}
+                for column, default, read in columns)))
+    return output
+
+
 def add_localized_fields(model):
     """
     Monkey patchs the original model class to provide additional fields for
     every language. Only do that for fields which are defined in the
     translation options of the model.
 
+    How the translations are stored is up to the storage of each field (see
+    ``modeltranslation.storage``), which is kept in the ``storages`` dict of
+    the translation options mapping each field and language to its storage.
+    If the translation options set ``translation_status``, a
+    ``TranslationStatusField`` named ``translated_<lang>`` is added for every
+    language.
+
     Returns a dict mapping the original fieldname to a list containing the
     names of the localized fields created for the original field.
     """
     localized_fields = dict()
     translation_opts = translator.get_options_for_model(model)
+    translation_opts.storages = dict()
+    languages = [l[0] for l in settings.LANGUAGES]
     for field_name in translation_opts.fields:
         localized_fields[field_name] = list()
-        for l in settings.LANGUAGES:
-            # Create a dynamic translation field
-            translation_field = create_translation_field(
-                model=model, field_name=field_name, lang=l[0])
-            # Construct the name for the localized field
-            localized_field_name = build_localized_fieldname(field_name, l[0])
-            # Check if the model already has a field by that name
-            if hasattr(model, localized_field_name):
-                raise ValueError(
-                    "Error adding translation field. Model '%s' already "
-                    "contains a field named '%s'." % (
-                        model.__class__.__name__, localized_field_name))
-            # This approach implements the translation fields as full valid
-            # django model fields and therefore adds them via add_to_class
-            model.add_to_class(localized_field_name, translation_field)
-            localized_fields[field_name].append(localized_field_name)
+        storages = translation_opts.storages[field_name] = dict()
+        for storage in create_translation_storages(
+                model, field_name, translation_opts):
+            localized_fields[field_name].extend(
+                storage.contribute_to_class(translation_opts))
+            for lang in storage.languages:
+                storages[lang] = storage
+        # Keep the localized fields in the order of the languages
+        order = [translator.get_localized_fieldname(model, field_name, l)
+                 for l in languages]
+        localized_fields[field_name].sort(key=order.index)
+    if getattr(translation_opts, 'translation_status', False):
+        for lang in languages:
+            name = build_localized_fieldname('translated', lang)
+            check_localized_name(model, name)
+            model.add_to_class(name, TranslationStatusField(
+                translation_opts.fields, lang))
     return localized_fields
 
 
@@ -77,6 +404,68 @@ def delete_cache_fields(model):
         pass
 
 
+def delete_related_cache_fields(models):
+    """
+    Deletes the fields cache of all models related to one of ``models`` or
+    their parents, like ``delete_cache_fields`` for the related objects of
+    each model, but looking at every model only once.
+    """
+    targets = set()
+    for model in models:
+        targets.add(model)
+        targets.update(model._meta.get_parent_list())
+    if not targets:
+        return
+    for klass in get_models(include_auto_created=True, only_installed=False):
+        for f in klass._meta.local_fields:
+            if f.rel and f.rel.to in targets:
+                delete_cache_fields(klass)
+                break
+
+
+def snapshot_translation_fields(sender, instance, **kwargs):
+    """
+    Stores the values of the translation fields of ``instance`` after it was
+    loaded or saved, if the translation options of its model set
+    ``track_changes``. ``TranslationField.pre_save`` compares against them to
+    leave unchanged translation fields out when saving.
+    """
+    # Deferred models are proxies of the registered model
+    opts = translator._registry.get(sender._meta.concrete_model)
+    fieldnames = getattr(opts, 'tracked_fieldnames', None)
+    if fieldnames is None:
+        return
+    values = instance.__dict__
+    values['_translation_snapshot'] = dict(
+        (name, values[name]) for name in fieldnames if name in values)
+
+
+def connect_snapshot_signals(sender):
+    """
+    Takes the snapshots of the instances of ``sender`` only, so the
+    instances of other models don't pay for dispatching the signals.
+    """
+    signals.post_init.connect(
+        snapshot_translation_fields, sender=sender,
+        dispatch_uid='modeltranslation_snapshot_post_init')
+    signals.post_save.connect(
+        snapshot_translation_fields, sender=sender,
+        dispatch_uid='modeltranslation_snapshot_post_save')
+
+
+def track_deferred_class(sender, **kwargs):
+    """
+    Connects the snapshot signals for the classes Django creates for
+    deferred fields of models tracking changes, which send the signals
+    themselves.
+    """
+    if not getattr(sender, '_deferred', False):
+        return
+    opts = translator._registry.get(sender._meta.concrete_model)
+    if getattr(opts, 'tracked_fieldnames', None) is not None:
+        connect_snapshot_signals(sender)
+
+
 class Translator(object):
     """
     A Translator object encapsulates an instance of a translator. Models are
@@ -85,6 +474,31 @@ class Translator(object):
     def __init__(self):
         # model_class class -> translation_opts instance
         self._registry = {}
+        # model_class class -> translation_opts instance or None, for the
+        # models looked up with get_options_for_model
+        self._options_cache = {}
+        # model_class class -> TranslationLookups instance, see freeze
+        self._lookups = {}
+        # field name -> tuple of the model classes registering the field,
+        # see get_models_for_field
+        self._field_models = None
+        # The models registered in the running batch, see batch
+        self._batch = None
+        # Stack of the running journals, see start_journal
+        self._journals = []
+        # The registry the caches were filled from, in case ``_registry`` is
+        # replaced as a whole
+        self._caches_registry = self._registry
+
+    def _clear_caches(self):
+        self._options_cache.clear()
+        self._lookups = {}
+        self._field_models = None
+        self._caches_registry = self._registry
+
+    def _check_caches(self):
+        if self._caches_registry is not self._registry:
+            self._clear_caches()
 
     def register(self, model_or_iterable, translation_opts, **options):
         """
@@ -114,8 +528,25 @@ class Translator(object):
                     "%sTranslationOptions" % model.__name__,
                     (translation_opts,), options)
 
+            translated_fields = (list(translation_opts.fields) +
+                                 list(get_translated_fields(model)))
+            for index in getattr(translation_opts, 'indexes', None) or ():
+                index.validate(model, translated_fields)
+            manager_name = getattr(translation_opts, 'translated_manager',
+                                   None)
+            if manager_name is not None and (
+                    manager_name in model.__dict__ or manager_name in
+                    [f.name for f in model._meta.fields]):
+                raise ImproperlyConfigured(
+                    "The translated_manager of %s can't be added, the model "
+                    "already has an attribute named '%s'." % (
+                        model.__name__, manager_name))
+
             # Store the translation class associated to the model
+            if self._journals:
+                self._journals[-1].append((model, None))
             self._registry[model] = translation_opts
+            self._clear_caches()
 
             # Add the localized fields to the model and store the names of
             # these fields in the model's translation options for faster lookup
@@ -131,26 +562,95 @@ class Translator(object):
                     rev_dict[ln] = orig_name
             translation_opts.localized_fieldnames_rev = rev_dict
 
-            # Delete all fields cache for related model (parent and children)
-            for related_obj in model._meta.get_all_related_objects():
-                delete_cache_fields(related_obj.model)
-
-        model_fallback_values = getattr(
-            translation_opts, 'fallback_values', None)
-        for field_name in translation_opts.fields:
-            if model_fallback_values is None:
-                field_fallback_value = None
-            elif isinstance(model_fallback_values, dict):
-                field_fallback_value = model_fallback_values.get(
-                    field_name, None)
+            if self._batch is not None:
+                # The caches are deleted once the batch is finished
+                self._batch.append(model)
             else:
-                field_fallback_value = model_fallback_values
-            setattr(model, field_name, TranslationFieldDescriptor(
-                field_name, fallback_value=field_fallback_value))
+                # Delete all fields cache for related model (parent and
+                # children)
+                for related_obj in model._meta.get_all_related_objects():
+                    delete_cache_fields(related_obj.model)
+
+            # Make the managers of the model return translation aware
+            # querysets
+            patch_managers(model)
+            if manager_name is not None and not model._meta.abstract:
+                # A manager rewriting lookups on translated fields to the
+                # current language, the other managers are left as they are
+                model.add_to_class(manager_name, CurrentLanguageManager())
+
+            if getattr(translation_opts, 'track_changes', False):
+                # Track the changes of the original and translation fields
+                # (including the ones of registered parents) to save only the
+                # changed translation fields
+                attnames = self.get_lookups(model).attnames
+                tracked_fieldnames = []
+                for field_name in get_translated_fields(model):
+                    tracked_fieldnames.append(field_name)
+                    tracked_fieldnames.extend(
+                        attnames[field_name, l[0]] for l in settings.LANGUAGES)
+                translation_opts.tracked_fieldnames = tracked_fieldnames
+                connect_snapshot_signals(model)
+                signals.class_prepared.connect(
+                    track_deferred_class,
+                    dispatch_uid='modeltranslation_track_deferred_class')
+
+            model_fallback_values = getattr(
+                translation_opts, 'fallback_values', None)
+            attnames = self.get_lookups(model).attnames
+            for field_name in translation_opts.fields:
+                if model_fallback_values is None:
+                    field_fallback_value = None
+                elif isinstance(model_fallback_values, dict):
+                    field_fallback_value = model_fallback_values.get(
+                        field_name, None)
+                else:
+                    field_fallback_value = model_fallback_values
+                # Map every language to the name of its translation field
+                # once, so the descriptor doesn't have to build it on access.
+                localized_fieldnames = dict(
+                    (l[0], attnames[field_name, l[0]])
+                    for l in settings.LANGUAGES)
+                setattr(model, field_name, TranslationFieldDescriptor(
+                    field_name, fallback_value=field_fallback_value,
+                    localized_fieldnames=localized_fieldnames,
+                    dedupe=is_deduplicated(translation_opts, field_name)))
+
+            # Lookups compiled while the model was being registered might
+            # be incomplete
+            self._clear_caches()
 
         #signals.pre_init.connect(translated_model_initializing, sender=model,
                                  #weak=False)
 
+    @contextmanager
+    def batch(self):
+        """
+        Registers the models of all ``register`` calls within the ``with``
+        block as one batch::
+
+            with translator.batch():
+                translator.register(News, NewsTranslationOptions)
+                translator.register(Event, EventTranslationOptions)
+
+        Registering a model deletes the field caches of the models related
+        to it, which finding the related models of every model is costly
+        for. A batch deletes the caches of all models related to any model
+        of the batch once at the end instead, using a single pass over all
+        models. Until then the field caches of models related to the
+        registered models might lack their translation fields. Nested
+        batches are part of the outermost batch.
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+        finally:
+            models, self._batch = self._batch, None
+            delete_related_cache_fields(models)
+
     def unregister(self, model_or_iterable):
         """
         Unregisters the given model(s).
@@ -163,12 +663,71 @@ class Translator(object):
             if model not in self._registry:
                 raise NotRegistered('The model "%s" is not registered for '
                                     'translation' % model.__name__)
+            if self._journals:
+                self._journals[-1].append((model, self._registry[model]))
             del self._registry[model]
+            self._clear_caches()
+
+    def start_journal(self):
+        """
+        Starts recording the changes ``register`` and ``unregister`` make to
+        the registry and returns the journal, a list of ``(model,
+        translation_opts)`` tuples of the options each change replaced
+        (``None`` for registrations). The journal is finished by
+        ``end_journal``, which can roll the changes back; recording them is
+        cheaper than copying the registry up front. Journals can be nested.
+        """
+        journal = []
+        self._journals.append(journal)
+        return journal
+
+    def end_journal(self, journal, rollback=False):
+        """
+        Finishes ``journal``, which has to be the innermost running journal.
+        If ``rollback`` is true the changes recorded in it are undone,
+        otherwise they are passed on to the enclosing journal, if any.
+
+        Rolling back only restores the registry, the fields a registration
+        added to its model stay in place.
+        """
+        if not self._journals or self._journals[-1] is not journal:
+            raise ValueError('The journal is not the innermost running '
+                             'journal.')
+        self._journals.pop()
+        if rollback:
+            for model, translation_opts in reversed(journal):
+                if translation_opts is None:
+                    self._registry.pop(model, None)
+                else:
+                    self._registry[model] = translation_opts
+            self._clear_caches()
+        elif self._journals:
+            self._journals[-1].extend(journal)
 
     def get_options_for_model(self, model):
         """
         Returns the translation options for the given ``model``. If the
         ``model`` is not registered a ``NotRegistered`` exception is raised.
+
+        The options built for models inheriting from registered models, as
+        well as the models found not to be registered, are cached until the
+        next call of ``register`` or ``unregister``.
+        """
+        self._check_caches()
+        try:
+            translation_opts = self._options_cache[model]
+        except KeyError:
+            translation_opts = self._options_cache[model] = \
+                self._build_options_for_model(model)
+        if translation_opts is None:
+            raise NotRegistered('The model "%s" is not registered for '
+                                'translation' % model.__name__)
+        return translation_opts
+
+    def _build_options_for_model(self, model):
+        """
+        Returns the translation options for the given ``model`` or ``None``
+        if neither the model nor one of its parents is registered.
         """
         try:
             return self._registry[model]
@@ -180,6 +739,7 @@ class Translator(object):
             fields = set()
             localized_fieldnames = {}
             localized_fieldnames_rev = {}
+            storages = {}
             for parent in model._meta.parents.keys():
                 if parent in self._registry:
                     trans_opts = self._registry[parent]
@@ -188,20 +748,133 @@ class Translator(object):
                         trans_opts.localized_fieldnames)
                     localized_fieldnames_rev.update(
                         trans_opts.localized_fieldnames_rev)
+                    storages.update(trans_opts.storages)
             if fields and localized_fieldnames and localized_fieldnames_rev:
                 options = {
                     '__module__': __name__,
                     'fields': tuple(fields),
                     'localized_fieldnames': localized_fieldnames,
-                    'localized_fieldnames_rev': localized_fieldnames_rev
+                    'localized_fieldnames_rev': localized_fieldnames_rev,
+                    'storages': storages,
                 }
                 translation_opts = type(
                     "%sTranslation" % model.__name__,
                     (TranslationOptions,), options)
                 # delete_cache_fields(model)
                 return translation_opts
-            raise NotRegistered('The model "%s" is not registered for '
-                                'translation' % model.__name__)
+            return None
+
+    def freeze(self):
+        """
+        Compiles the lookup tables of all registered models, see
+        ``get_lookups`` and ``get_models_for_field``. Called once all
+        translation options have been registered (after ``autodiscover``),
+        so that looking up translation fields never has to build their
+        names. Registering or unregistering a model afterwards discards the
+        compiled tables, which are then compiled again on demand.
+        """
+        self._check_caches()
+        for model in self._registry.keys():
+            self.get_lookups(model)
+        self.get_models_for_field(None)
+
+    def get_lookups(self, model):
+        """
+        Returns the ``TranslationLookups`` of ``model``, compiling them on
+        first use.
+        """
+        self._check_caches()
+        try:
+            return self._lookups[model]
+        except KeyError:
+            lookups = self._lookups[model] = TranslationLookups(
+                model, self._registry)
+            return lookups
+
+    def get_translated_fields(self, model):
+        """
+        Returns the names of the translated fields of ``model``, including
+        the ones inherited from parent models registered for translation.
+        """
+        return self.get_lookups(model).fields
+
+    def get_localized_fieldname(self, model, field_name, lang):
+        """
+        Returns the name of the translation field of the translated field
+        ``field_name`` of ``model`` in ``lang``.
+        """
+        try:
+            return self.get_lookups(model).attnames[field_name, lang]
+        except KeyError:
+            return build_localized_fieldname(field_name, lang)
+
+    def split_localized_fieldname(self, model, name):
+        """
+        Returns a ``(field_name, lang)`` tuple if ``name`` is a translation
+        field of a translated field of ``model``, otherwise ``None``.
+        """
+        return self.get_lookups(model).translations.get(name)
+
+    def get_models_for_field(self, field_name):
+        """
+        Returns a tuple of the models registering ``field_name`` for
+        translation, compiling the table of all fields on first use.
+        """
+        self._check_caches()
+        if self._field_models is None:
+            field_models = {}
+            for model, opts in self._registry.items():
+                for name in opts.fields:
+                    field_models.setdefault(name, []).append(model)
+            self._field_models = ImmutableDict(
+                (name, tuple(models)) for name, models in
+                field_models.items())
+        return self._field_models.get(field_name, ())
+
+
+
+class ImmutableDict(dict):
+    """
+    A dict which raises a ``TypeError`` when it's changed.
+    """
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('%s is immutable.' % self.__class__.__name__)
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = _immutable
+
+
+class TranslationLookups(object):
+    """
+    The translation fields of a model compiled into lookup tables, which
+    can't be changed once built:
+
+    ``fields``
+        Tuple of the names of the translated fields, including the ones
+        inherited from registered parents.
+    ``attnames``
+        Maps ``(field_name, lang)`` tuples to the name of the translation
+        field.
+    ``translations``
+        Maps the name of each translation field to its ``(field_name,
+        lang)`` tuple.
+    """
+    def __init__(self, model, registry):
+        fields = []
+        for klass in [model] + list(model._meta.get_parent_list()):
+            opts = registry.get(klass)
+            if opts is not None:
+                fields.extend(f for f in opts.fields if f not in fields)
+        self.fields = tuple(fields)
+        attnames = {}
+        translations = {}
+        for field_name in self.fields:
+            for lang in mt_settings.AVAILABLE_LANGUAGES:
+                name = build_localized_fieldname(field_name, lang)
+                attnames[field_name, lang] = name
+                translations[name] = field_name, lang
+        self.attnames = ImmutableDict(attnames)
+        self.translations = ImmutableDict(translations)
 
 
 # This global object represents the singleton translator object
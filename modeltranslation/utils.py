@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from django.conf import global_settings
 from django.utils.encoding import force_unicode
 from django.utils.translation import get_language as _get_language
 from django.utils.functional import lazy
@@ -6,17 +7,33 @@ from django.utils.functional import lazy
 from modeltranslation import settings
 
 
+def _resolve_language(lang):
+    if lang not in settings.AVAILABLE_LANGUAGES and '-' in lang:
+        lang = lang.split('-')[0]
+    if lang in settings.AVAILABLE_LANGUAGES:
+        return lang
+    return settings.DEFAULT_LANGUAGE
+
+
+# Maps every language code Django might return to a code that is guaranteed
+# to be in settings.LANGUAGES. Codes missing here are resolved on first use.
+_language_map = dict(
+    (lang, _resolve_language(lang)) for lang in set(
+        [l[0] for l in global_settings.LANGUAGES] +
+        settings.AVAILABLE_LANGUAGES))
+
+
 def get_language():
     """
     Return an active language code that is guaranteed to be in
     settings.LANGUAGES (Django does not seem to guarantee this for us).
     """
     lang = _get_language()
-    if lang not in settings.AVAILABLE_LANGUAGES and '-' in lang:
-        lang = lang.split('-')[0]
-    if lang in settings.AVAILABLE_LANGUAGES:
-        return lang
-    return settings.DEFAULT_LANGUAGE
+    try:
+        return _language_map[lang]
+    except KeyError:
+        resolved = _language_map[lang] = _resolve_language(lang)
+        return resolved
 
 
 def get_translation_fields(field):